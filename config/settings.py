@@ -2,7 +2,7 @@
 
 import yaml
 from pydantic import BaseModel, Field
-from typing import List, Literal
+from typing import Dict, List, Literal
 import os
 
 # --- Model Pydantic untuk Struktur Konfigurasi ---
@@ -15,12 +15,29 @@ class BrowserSettings(BaseModel):
     headless: bool = False
     args: List[str] = []
     ignore_default_args: List[str] = []
+    # Restart Chromium setelah sejumlah container (0 = tidak pernah)
+    restart_after: int = 0
+    # File cookies/localStorage yang diekspor setelah CAPTCHA dan dipakai
+    # mengisi setiap konteks baru (kosong = nonaktif)
+    storage_state_path: str = os.path.abspath("./profile_state.json")
+    # Umur maksimum (jam) storage state sebelum dianggap basi
+    storage_state_max_age_hours: float = 12.0
 
 
 class ExtensionsSettings(BaseModel):
     paths: List[str] = []
 
 
+class BlockingSettings(BaseModel):
+    enabled: bool = True
+    # Tipe resource Playwright yang diblokir (image, font, media, stylesheet, ...)
+    resource_types: List[str] = ["image", "font", "media"]
+    # Domain iklan/analitik yang selalu diblokir, termasuk subdomainnya
+    domains: List[str] = []
+    # Domain yang resource-nya tidak diblokir berdasarkan tipe (mis. gambar CAPTCHA)
+    allow_domains: List[str] = []
+
+
 class LoggingSettings(BaseModel):
     log_dir: str = "logs"
     level: Literal["INFO", "DEBUG", "WARNING", "ERROR"] = "INFO"
@@ -32,9 +49,6 @@ class TimeoutSettings(BaseModel):
     selector_wait: int = 10000
     popup: int = 5000
     page_load: int = 30000
-    password_check: int = 5
-    captcha_check: int = 5
-    batch_delay: int = 1
     captcha: int = 300
     password: int = 300
 
@@ -47,10 +61,79 @@ class PixeldrainSettings(BaseModel):
     bypass_urls: List[str] = []
 
 
+class DatabaseSettings(BaseModel):
+    # Detik menunggu lock sebelum SQLite menyerah (busy_timeout)
+    busy_timeout: float = 30.0
+    # Jumlah prepared statement yang di-cache per koneksi
+    cached_statements: int = 256
+    # Ukuran jendela baca memory-mapped dalam byte
+    mmap_size: int = 268435456
+
+
+class FreshnessSettings(BaseModel):
+    # Umur maksimum (jam) link download sebelum dianggap kedaluwarsa
+    default_ttl_hours: float = 72.0
+    # TTL khusus per provider, contoh {"Send": 24}
+    provider_ttl_hours: Dict[str, float] = {}
+    # Buka ulang tombol download untuk baris kedaluwarsa saat container di-scrape
+    refresh_on_scrape: bool = False
+
+    def ttl_for(self, provider: str) -> float:
+        for name, hours in self.provider_ttl_hours.items():
+            if name.lower() == (provider or "").lower():
+                return hours
+        return self.default_ttl_hours
+
+
+class ExportSettings(BaseModel):
+    # Jumlah proses untuk membuat file individual (0 = jumlah core CPU)
+    workers: int = 0
+
+
+class DaemonSettings(BaseModel):
+    # Jeda (detik) antar pengecekan antrian saat tidak ada job
+    poll_interval: float = 5.0
+    # Job yang gagal dikembalikan ke antrian sampai batas percobaan ini
+    max_attempts: int = 3
+    # Job running yang dimulai lebih lama dari ini (detik) dianggap milik
+    # daemon yang berhenti mendadak dan dikembalikan ke antrian saat start
+    stale_running_after: float = 3600.0
+
+
 class ScraperSettings(BaseModel):
     batch_processing: bool = True
+    # Batas atas ukuran batch popup; menjadi ukuran tetap jika adaptive_batch mati
     max_batch_size: int = 8
+    adaptive_batch: bool = True
+    min_batch_size: int = 1
+    initial_batch_size: int = 3
+    # Latensi rata-rata per popup (detik) di atas nilai ini menurunkan ukuran batch
+    popup_target_latency: float = 3.0
+    # Rasio popup gagal dalam satu batch yang membuat ukuran batch dipotong setengah
+    batch_max_failure_rate: float = 0.2
+    # Jumlah percobaan maksimal per item (termasuk percobaan pertama)
+    retry_attempts: int = 3
+    # Jeda dasar (detik) antrian ulang, berlipat tiap putaran dengan jitter
+    retry_backoff: float = 2.0
     valid_urls: List[str] = []
+    # Jumlah tab untuk daftar URL (1 = berurutan). Hanya engine async yang
+    # memproses tab benar-benar bersamaan; engine sync memproses satu tab pada
+    # satu waktu sementara tab lain memuat URL berikutnya
+    concurrent_tabs: int = 1
+    # Jumlah proses browser untuk daftar URL, masing-masing dengan salinan
+    # user_data_dir sendiri (1 = satu proses)
+    processes: int = 1
+    # Engine untuk daftar URL: "async" (asyncio, tab bersamaan) atau "sync"
+    # (playwright.sync_api, satu tab diproses pada satu waktu)
+    engine: Literal["sync", "async"] = "async"
+    # "network": URL download dibaca dari navigasi popup tanpa merender halaman
+    # provider, "popup": menunggu popup selesai dimuat seperti sebelumnya
+    popup_resolution: Literal["network", "popup"] = "network"
+    # Lewati container yang daftar barisnya (judul/provider/ukuran) tidak berubah
+    skip_unchanged: bool = True
+    # Parkir container yang meminta password/CAPTCHA (tab tetap terbuka) dan
+    # lanjutkan URL lain; berlaku untuk pemrosesan beberapa tab/async
+    park_interactive: bool = True
 
 
 class AppSettings(BaseModel):
@@ -58,11 +141,16 @@ class AppSettings(BaseModel):
 
     browser: BrowserSettings
     extensions: ExtensionsSettings
+    blocking: BlockingSettings = BlockingSettings()
     logging: LoggingSettings
     timeouts: TimeoutSettings
     providers: ProviderSettings
     pixeldrain: PixeldrainSettings
     scraper: ScraperSettings
+    database: DatabaseSettings = DatabaseSettings()
+    freshness: FreshnessSettings = FreshnessSettings()
+    export: ExportSettings = ExportSettings()
+    daemon: DaemonSettings = DaemonSettings()
     user_agents: List[str] = []
 
 
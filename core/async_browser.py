@@ -0,0 +1,62 @@
+"""
+Modul untuk menangani operasi browser menggunakan Playwright versi asyncio
+"""
+
+import logging
+from playwright.async_api import async_playwright
+from .browser import BrowserManager, StorageState
+
+
+class AsyncBrowserManager(BrowserManager):
+    """
+    Varian asyncio dari BrowserManager, memakai konfigurasi browser yang sama
+    """
+
+    async def __aenter__(self):
+        self.playwright = await async_playwright().start()
+        try:
+            await self.launch_browser()
+        except Exception:
+            await self.playwright.stop()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close_browser()
+        if self.playwright:
+            await self.playwright.stop()
+
+    async def launch_browser(self):
+        try:
+            self.context = await self.playwright.chromium.launch_persistent_context(
+                **self.get_launch_options()
+            )
+            if self.blocker:
+                await self.context.route("**/*", self.blocker.handle_route_async)
+            await StorageState.seed_async(self.context)
+            return self.context
+        except Exception as e:
+            logging.error(f"[ERROR] Gagal membuka browser: {str(e)}")
+            raise
+
+    async def close_browser(self):
+        if self.context:
+            if StorageState.is_stale():
+                await StorageState.save_async(self.context)
+            try:
+                await self.context.close()
+            except Exception as e:
+                logging.error(f"[ERROR] Gagal menutup browser: {str(e)}")
+
+    async def close_about_blank_tabs(self):
+        main_pages = []
+        for page in self.context.pages:
+            if page.url == "about:blank":
+                try:
+                    if not page.is_closed():
+                        await page.close()
+                except Exception as e:
+                    logging.debug(f"[BROWSER] Gagal menutup tab: {e}")
+            else:
+                main_pages.append(page)
+        return main_pages
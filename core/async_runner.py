@@ -0,0 +1,205 @@
+"""
+Modul untuk memproses daftar URL secara bersamaan dengan engine asyncio
+"""
+
+import asyncio
+import logging
+from typing import Callable, List, Optional
+from config import DEFAULT_CONFIG
+from models.data_models import ContainerResult
+from .async_browser import AsyncBrowserManager
+from .async_scraper import AsyncFileCryptScraper
+from .utils import get_target_code
+
+
+async def scrape_container_async(
+    scraper: AsyncFileCryptScraper, url: str, selected_provider: Optional[str] = None
+) -> ContainerResult:
+    """Varian asyncio dari runner.scrape_container"""
+    target_code = get_target_code(url)
+    await scraper.wait_until_ready()
+    if not await scraper.handle_password():
+        raise RuntimeError("Gagal menangani password")
+    if not await scraper.handle_captcha():
+        raise RuntimeError("Gagal menangani CAPTCHA")
+
+    title, total_episodes = await scraper.get_additional_info()
+    container_title = (
+        title
+        if title and title.strip().lower() not in ("n/a", "unknown", "")
+        else target_code
+    )
+    logging.info(f"⚙⠀ [{target_code}] {container_title} ({total_episodes})")
+
+    if await scraper.is_unchanged():
+        return ContainerResult(
+            url=url,
+            target_code=target_code,
+            container_title=container_title,
+            episode_count=scraper.episode_count,
+            unchanged=True,
+        )
+
+    data = await scraper.scrape_file_info(selected_provider=selected_provider)
+    return ContainerResult(
+        url=url,
+        target_code=target_code,
+        container_title=container_title,
+        data=data,
+        episode_count=scraper.episode_count,
+        fingerprint=scraper.completed_fingerprint(data, selected_provider),
+    )
+
+
+async def run_urls_async(
+    urls: List[str],
+    tabs: Optional[int] = None,
+    selected_provider: Optional[str] = None,
+    on_result: Optional[Callable[[ContainerResult], None]] = None,
+    refresh: Optional[bool] = None,
+) -> List[ContainerResult]:
+    """
+    Memproses daftar URL dengan beberapa tab yang berjalan benar-benar
+    bersamaan di satu event loop, masing-masing dengan AsyncFileCryptScraper.
+    Container yang meminta password/CAPTCHA diparkir ke task tersendiri
+    (scraper.park_interactive) dan worker-nya lanjut dengan tab baru.
+    """
+    tabs = max(1, tabs or DEFAULT_CONFIG.scraper.concurrent_tabs)
+    park = DEFAULT_CONFIG.scraper.park_interactive
+    queue: asyncio.Queue = asyncio.Queue()
+    for url in urls:
+        queue.put_nowait(url)
+    results: List[ContainerResult] = []
+    parked: List[asyncio.Task] = []
+    logging.info(f"⚙⠀ Memproses {len(urls)} URL dengan {tabs} tab (async)")
+
+    async with AsyncBrowserManager() as browser_manager:
+
+        def record(result: ContainerResult):
+            results.append(result)
+            if on_result:
+                on_result(result)
+
+        async def new_scraper() -> AsyncFileCryptScraper:
+            scraper = AsyncFileCryptScraper(
+                await browser_manager.context.new_page(), refresh
+            )
+            # Progress bar rich tidak bisa tampil untuk beberapa tab sekaligus
+            scraper.show_progress = tabs == 1
+            return scraper
+
+        async def resume(scraper: AsyncFileCryptScraper, url: str, reason: str):
+            # handle_password/handle_captcha menunggu di task ini saja
+            try:
+                result = await _scrape(scraper, url, selected_provider)
+                result.needs_attention = reason
+                record(result)
+            finally:
+                await _close_page(scraper)
+
+        async def worker():
+            scraper = await new_scraper()
+            try:
+                while True:
+                    try:
+                        url = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    try:
+                        reason = await _open(scraper, url, park)
+                    except Exception as e:
+                        record(_error_result(url, e))
+                        continue
+                    if reason:
+                        parked.append(asyncio.create_task(resume(scraper, url, reason)))
+                        scraper = await new_scraper()
+                        continue
+                    record(await _scrape(scraper, url, selected_provider))
+            finally:
+                await _close_page(scraper)
+
+        await asyncio.gather(*(worker() for _ in range(min(tabs, len(urls)))))
+        waiting = [task for task in parked if not task.done()]
+        if waiting:
+            logging.info(
+                f"⏳⠀Menunggu password/CAPTCHA diselesaikan untuk {len(waiting)} container"
+            )
+        await asyncio.gather(*parked)
+
+    return results
+
+
+async def _close_page(scraper: AsyncFileCryptScraper):
+    try:
+        await scraper.page.close()
+    except Exception as e:
+        logging.warning(f"[WARNING] Gagal menutup halaman: {str(e)}")
+
+
+def _error_result(url: str, error: Exception) -> ContainerResult:
+    logging.error(f"❌⠀ Gagal memproses URL {url}: {str(error)}")
+    target_code = get_target_code(url)
+    return ContainerResult(
+        url=url,
+        target_code=target_code,
+        container_title=target_code,
+        error=str(error),
+    )
+
+
+async def _open(scraper: AsyncFileCryptScraper, url: str, park: bool) -> Optional[str]:
+    """
+    Memuat URL. Mengembalikan "password"/"captcha" jika container diparkir,
+    None jika bisa langsung di-scrape
+    """
+    for attempt in range(3):
+        try:
+            await scraper.page.goto(url, wait_until="load", timeout=15000)
+            break
+        except Exception as e:
+            logging.warning(
+                f"[WARNING] Gagal memuat URL, mencoba lagi ({attempt + 1}/3): {str(e)}"
+            )
+            await asyncio.sleep(2)
+    else:
+        raise RuntimeError("Gagal memuat URL setelah 3 percobaan")
+
+    if not park:
+        return None
+    await scraper.wait_until_ready()
+    if await scraper.detect_password():
+        reason = "password"
+    elif await scraper.detect_captcha():
+        reason = "captcha"
+    else:
+        return None
+    logging.warning(
+        f"🔐⠀[{get_target_code(url)}] Butuh {reason}, diparkir sampai diselesaikan di tab-nya"
+    )
+    try:
+        await scraper.page.bring_to_front()
+    except Exception as e:
+        logging.debug(f"[RUNNER] Gagal menampilkan tab {url}: {str(e)}")
+    return reason
+
+
+async def _scrape(
+    scraper: AsyncFileCryptScraper, url: str, selected_provider: Optional[str]
+) -> ContainerResult:
+    try:
+        return await scrape_container_async(scraper, url, selected_provider)
+    except Exception as e:
+        return _error_result(url, e)
+
+
+def run_urls(
+    urls: List[str],
+    tabs: Optional[int] = None,
+    selected_provider: Optional[str] = None,
+    on_result: Optional[Callable[[ContainerResult], None]] = None,
+    refresh: Optional[bool] = None,
+) -> List[ContainerResult]:
+    """Titik masuk sync untuk run_urls_async"""
+    return asyncio.run(
+        run_urls_async(urls, tabs, selected_provider, on_result, refresh)
+    )
@@ -0,0 +1,321 @@
+"""
+Modul scraping FileCrypt versi asyncio, menghasilkan ScrapedData yang sama
+dengan FileCryptScraper
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, List, Optional
+from models.data_models import ScrapedData
+from .browser import StorageState
+from .logger import BatchLogger
+from .popup_resolver import PopupResolver
+from .scraper import (
+    CAPTCHA_SELECTOR,
+    PASSWORD_SELECTOR,
+    READY_SELECTOR,
+    ROW_EXTRACT_JS,
+    FileCryptScraper,
+)
+
+
+class AsyncFileCryptScraper(FileCryptScraper):
+    """
+    Varian asyncio dari FileCryptScraper. Logika non-I/O (normalisasi provider,
+    bypass pixeldrain, penggabungan hasil) diwarisi dari versi sync.
+    """
+
+    async def wait_until_ready(self) -> bool:
+        try:
+            await self.page.wait_for_selector(
+                READY_SELECTOR, timeout=self.timeouts.selector_wait
+            )
+            return True
+        except Exception as e:
+            logging.debug(f"[MAIN] Halaman belum siap: {str(e)}")
+            return False
+
+    async def _wait_prompt_gone(
+        self,
+        selector: str,
+        detect: Callable[[], Awaitable[bool]],
+        name: str,
+        timeout: float,
+    ) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                await self.page.wait_for_selector(
+                    selector, state="detached", timeout=remaining * 1000
+                )
+            except Exception:
+                return False
+            if await self.wait_until_ready() and not await detect():
+                return True
+            logging.info(f"🔐⠀{name} belum selesai, menunggu lagi...")
+
+    async def detect_password(self) -> bool:
+        try:
+            return bool(await self.page.query_selector(PASSWORD_SELECTOR))
+        except Exception as e:
+            logging.error(f"[ERROR] Error deteksi password: {str(e)}")
+            return False
+
+    async def handle_password(self) -> bool:
+        if not await self.detect_password():
+            logging.info("🔓⠀URL tidak membutuhkan password")
+            return True
+        logging.info("🔐⠀Menunggu input password...")
+        timeout = self.timeouts.password
+        if not await self._wait_prompt_gone(
+            PASSWORD_SELECTOR, self.detect_password, "Password", timeout
+        ):
+            logging.error(f"[ERROR] Timeout password setelah {timeout} detik")
+            return False
+        logging.info("🔓⠀Password berhasil ditangani")
+        await StorageState.save_async(self.page.context)
+        return True
+
+    async def detect_captcha(self) -> bool:
+        try:
+            return bool(await self.page.query_selector(CAPTCHA_SELECTOR))
+        except Exception as e:
+            logging.error(f"[ERROR] Error deteksi captcha: {str(e)}")
+            return False
+
+    async def handle_captcha(self) -> bool:
+        if not await self.detect_captcha():
+            logging.info("🔓⠀CAPTCHA tidak terdeteksi")
+            return True
+        logging.info("🔐⠀Menunggu penyelesaian CAPTCHA...")
+        timeout = self.timeouts.captcha
+        if not await self._wait_prompt_gone(
+            CAPTCHA_SELECTOR, self.detect_captcha, "CAPTCHA", timeout
+        ):
+            logging.error(f"[ERROR] Timeout CAPTCHA setelah {timeout} detik")
+            return False
+        logging.info("🔓⠀CAPTCHA berhasil diselesaikan")
+        await StorageState.save_async(self.page.context)
+        return True
+
+    async def is_unchanged(self) -> bool:
+        try:
+            await self.page.wait_for_selector(
+                "tr.kwj3", timeout=self.timeouts.selector_wait
+            )
+            rows = await self.page.evaluate(ROW_EXTRACT_JS)
+        except Exception as e:
+            logging.debug(f"[MAIN] Gagal membaca daftar baris: {str(e)}")
+            return False
+        if self._matches_stored_fingerprint(rows):
+            logging.info(
+                f"⏭⠀ [{self._get_target_code()}] Daftar file tidak berubah, popup dilewati"
+            )
+            return True
+        return False
+
+    async def get_available_providers(self) -> List[str]:
+        try:
+            await self.page.wait_for_selector(
+                "select#x_h", timeout=self.timeouts.selector_wait
+            )
+            options = await self.page.query_selector_all("select#x_h option")
+
+            providers = set()
+            for option in options:
+                provider_text = (await option.text_content() or "").strip()
+                # Abaikan opsi default seperti "Select Provider" atau yang kosong
+                if not provider_text or "select" in provider_text.lower():
+                    continue
+                providers.add(provider_text)
+
+            return sorted(providers)
+        except Exception as e:
+            logging.error(f"[ERROR] Gagal mendapatkan provider: {str(e)}")
+            return []
+
+    async def get_additional_info(self) -> tuple[str, str]:
+        """
+        Mengambil judul dan total episode dari halaman
+        Mengembalikan (judul, total_episodes)
+        """
+        # Scraper dipakai ulang antar container: jangan bawa jumlah episode lama
+        self.episode_count = None
+        try:
+            await self.page.wait_for_selector(
+                "h1#x_t", timeout=self.timeouts.selector_wait
+            )
+            title_element = await self.page.query_selector("h1#x_t")
+            title = (
+                (await title_element.text_content() or "").strip()
+                if title_element
+                else "Unknown"
+            )
+            self.container_title = (
+                title
+                if title and title.lower() not in ("n/a", "", "unknown")
+                else "Unknown"
+            )
+
+            # Hitung total episode dari jumlah option di select#x_e
+            options = await self.page.query_selector_all("select#x_e option")
+            total_episodes = max(0, len(options) - 1)
+            self.episode_count = total_episodes
+
+            return self.container_title, f"{total_episodes} Episode"
+        except Exception as e:
+            logging.debug(f"[MAIN] Gagal mengambil info tambahan: {str(e)}")
+            self.container_title = "Unknown"
+            return "Unknown", "0 Episode"
+
+    async def _get_popup_resolver(self) -> Optional[PopupResolver]:
+        if self.scraper_config.popup_resolution != "network":
+            return None
+        return await PopupResolver.for_context_async(self.page.context)
+
+    async def _wait_popup_url(self, popup) -> str:
+        resolver = self.popup_resolver
+        if resolver is None:
+            await popup.wait_for_load_state(
+                "domcontentloaded", timeout=self.timeouts.page_load
+            )
+            return popup.url
+
+        if not resolver.has(popup):
+            try:
+                # Navigasi yang ditangkap resolver selalu dibatalkan (requestfailed)
+                await popup.wait_for_event(
+                    "requestfailed",
+                    predicate=lambda request: resolver.has(popup),
+                    timeout=self.timeouts.page_load,
+                )
+            except Exception:
+                # Popup lolos dari route, pakai URL halamannya jika sudah di provider
+                if popup.url.startswith("http") and not resolver.is_internal(
+                    popup.url
+                ):
+                    return popup.url
+                raise
+        return resolver.pop(popup)
+
+    async def _resolve_popup(self, item: ScrapedData, popup):
+        try:
+            self._apply_download_url(item, await self._wait_popup_url(popup))
+            await popup.close()
+        except Exception as e:
+            logging.debug(f"[MAIN] Gagal memproses popup untuk {item.title}: {str(e)}")
+            item.download_url = "ERROR"
+            item.bypass_url = "ERROR"
+
+    async def _run_popup_batch(self, batch: List[ScrapedData]) -> int:
+        """Membuka popup untuk satu batch dan mengembalikan jumlah item yang gagal"""
+        popups = []
+        for item in batch:
+            item.attempts += 1
+            if not item.download_button:
+                logging.debug(f"[MAIN] Tidak ada tombol download untuk {item.title}")
+                item.download_url = "ERROR"
+                item.bypass_url = "ERROR"
+                continue
+            try:
+                async with self.page.expect_popup(
+                    timeout=self.timeouts.popup
+                ) as popup_info:
+                    await item.download_button.click()
+                popups.append((item, await popup_info.value))
+            except Exception as e:
+                logging.debug(f"[MAIN] Gagal membuka popup untuk {item.title}: {str(e)}")
+                item.download_url = "ERROR"
+                item.bypass_url = "ERROR"
+
+        await asyncio.gather(
+            *(self._resolve_popup(item, popup) for item, popup in popups)
+        )
+        return sum(1 for item in batch if item.download_url == "ERROR")
+
+    async def _retry_failed_items(self, items: List[ScrapedData]):
+        """Fase 3: memproses ulang item ERROR setelah semua batch utama selesai"""
+        retry_round = 0
+        failed = self._failed_items(items)
+        while failed:
+            retry_round += 1
+            delay = self._retry_delay(retry_round)
+            logging.info(
+                f"🔁⠀Antrian ulang putaran {retry_round}: {len(failed)} item, jeda {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+            batch_size = max(1, self.scraper_config.min_batch_size)
+            for batch_start in range(0, len(failed), batch_size):
+                await self._run_popup_batch(
+                    failed[batch_start : batch_start + batch_size]
+                )
+            failed = self._failed_items(items)
+        self._log_retry_report(items)
+
+    async def scrape_file_info(
+        self,
+        selected_provider: Optional[str] = None,
+        all_providers: Optional[List[str]] = None,
+    ) -> List[ScrapedData]:
+        try:
+            await self.page.wait_for_selector(
+                "tr.kwj3", timeout=self.timeouts.selector_wait
+            )
+            # Fase 1: Ambil semua baris dalam satu round-trip
+            rows = await self.page.evaluate(ROW_EXTRACT_JS)
+            target_code = self._get_target_code()
+            self.fingerprint = self._fingerprint(rows)
+            total_rows = len(rows)
+            process_logger = BatchLogger(
+                total_items=total_rows * 2,
+                actual_items=total_rows,
+                process_name="SCRAPER",
+                show_progress=self.show_progress,
+            )
+            all_items, items_to_scrape, skipped_items = self._build_row_items(
+                rows, target_code, selected_provider
+            )
+            progress_count = total_rows
+            process_logger.log_progress(progress_count)
+
+            if not items_to_scrape:
+                process_logger.log_complete(skipped_items)
+                return all_items
+
+            # Fase 2: Proses batch per provider dengan ukuran batch adaptif,
+            # popup dalam satu batch ditunggu bersamaan
+            self.popup_resolver = await self._get_popup_resolver()
+            items_by_provider = self._group_by_provider(items_to_scrape)
+            for provider, provider_items in items_by_provider.items():
+                sizer = self._get_batch_sizer(provider)
+                batch_start = 0
+                while batch_start < len(provider_items):
+                    current_batch = provider_items[
+                        batch_start : batch_start + sizer.next_size()
+                    ]
+                    batch_start += len(current_batch)
+                    started = time.monotonic()
+                    failures = await self._run_popup_batch(current_batch)
+                    sizer.record(
+                        len(current_batch), failures, time.monotonic() - started
+                    )
+
+                    progress_count += len(current_batch)
+                    process_logger.log_progress(min(progress_count, total_rows * 2))
+
+            self._log_batch_summary(items_by_provider)
+
+            # Fase 3: Antrian ulang untuk item yang gagal
+            await self._retry_failed_items(items_to_scrape)
+            process_logger.log_complete(skipped_items)
+
+            # Gabungkan data
+            return self._merge_results(all_items, items_to_scrape)
+
+        except Exception as e:
+            logging.error(f"[ERROR] Gagal scrape di luar proses utama: {str(e)}")
+            return []
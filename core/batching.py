@@ -0,0 +1,75 @@
+"""
+Modul untuk menentukan ukuran batch popup secara adaptif
+"""
+
+import logging
+from config import DEFAULT_CONFIG
+
+
+class AdaptiveBatchSizer:
+    """
+    Mengatur ukuran batch popup dari latensi dan tingkat kegagalan yang teramati.
+
+    Latensi dibandingkan per popup (durasi batch / ukuran batch), karena durasi
+    seluruh batch ikut naik bersama ukurannya. Batch yang sukses penuh dengan
+    latensi per popup di bawah target menaikkan ukuran satu langkah, batch yang
+    lambat menurunkan satu langkah, dan tingkat gagal di atas batas memotong
+    ukuran menjadi setengah.
+    """
+
+    def __init__(self, name: str = "ALL"):
+        config = DEFAULT_CONFIG.scraper
+        self.name = name
+        self.enabled = config.adaptive_batch
+        self.maximum = max(1, config.max_batch_size)
+        self.minimum = max(1, min(config.min_batch_size, self.maximum))
+        self.target_latency = config.popup_target_latency
+        self.max_failure_rate = config.batch_max_failure_rate
+        self.size = (
+            max(self.minimum, min(config.initial_batch_size, self.maximum))
+            if self.enabled
+            else self.maximum
+        )
+        self.batches = 0
+        self.popups = 0
+        self.failures = 0
+        self.total_latency = 0.0
+
+    def next_size(self) -> int:
+        return self.size
+
+    def record(self, batch_size: int, failures: int, latency: float):
+        """Mencatat hasil satu batch dan menyesuaikan ukuran batch berikutnya"""
+        if batch_size <= 0:
+            return
+        self.batches += 1
+        self.popups += batch_size
+        self.failures += failures
+        self.total_latency += latency
+        if not self.enabled:
+            return
+
+        previous = self.size
+        failure_rate = failures / batch_size
+        per_popup = latency / batch_size
+        if failure_rate > self.max_failure_rate:
+            self.size = max(self.minimum, self.size // 2)
+        elif per_popup > self.target_latency:
+            self.size = max(self.minimum, self.size - 1)
+        elif failures == 0 and batch_size >= self.size:
+            self.size = min(self.maximum, self.size + 1)
+
+        if self.size != previous:
+            logging.info(
+                f"📦⠀[{self.name}] Ukuran batch {previous} → {self.size} "
+                f"(latensi {latency:.1f}s, {per_popup:.1f}s/popup, gagal {failures}/{batch_size})"
+            )
+
+    def summary(self) -> str:
+        if not self.batches:
+            return f"{self.name}: batch {self.size}"
+        avg_latency = self.total_latency / self.batches
+        return (
+            f"{self.name}: batch {self.size}, {self.batches} batch, "
+            f"rata-rata {avg_latency:.1f}s, gagal {self.failures}/{self.popups}"
+        )
@@ -2,12 +2,189 @@
 Modul untuk menangani operasi browser menggunakan Playwright
 """
 
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, Page
+import json
 import logging
+import time
 from typing import Optional
+from urllib.parse import urlparse
 from config import DEFAULT_CONFIG
 import os
 
+# Mengisi localStorage origin saat ini dari storage state, tanpa menimpa
+# nilai yang sudah ada di profil
+LOCAL_STORAGE_SEED_JS = """
+(origins) => {
+    try {
+        const entry = origins.find((o) => o.origin === window.location.origin);
+        if (!entry) return;
+        for (const { name, value } of entry.localStorage) {
+            if (window.localStorage.getItem(name) === null) {
+                window.localStorage.setItem(name, value);
+            }
+        }
+    } catch (e) {}
+}
+"""
+
+
+def _host_matches(host: Optional[str], domains: set) -> bool:
+    """True jika host sama dengan atau subdomain dari salah satu domain"""
+    if not host:
+        return False
+    parts = host.lower().split(".")
+    return any(".".join(parts[i:]) in domains for i in range(len(parts)))
+
+
+class ResourceBlocker:
+    """
+    Route di level konteks yang memblokir resource berat dan domain iklan/analitik
+    sesuai bagian "blocking" di config.yaml
+    """
+
+    def __init__(self):
+        self.config = DEFAULT_CONFIG.blocking
+        self.resource_types = set(self.config.resource_types)
+        self.domains = {d.lower() for d in self.config.domains}
+        self.allow_domains = {d.lower() for d in self.config.allow_domains}
+        self.blocked = 0
+
+    def should_block(self, request) -> bool:
+        host = urlparse(request.url).hostname
+        if _host_matches(host, self.domains):
+            return True
+        return request.resource_type in self.resource_types and not _host_matches(
+            host, self.allow_domains
+        )
+
+    def handle_route(self, route, request):
+        if self.should_block(request):
+            self.blocked += 1
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+
+    async def handle_route_async(self, route, request):
+        if self.should_block(request):
+            self.blocked += 1
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
+
+
+class StorageState:
+    """
+    Storage state Playwright (cookies + localStorage) yang diekspor setelah
+    password/CAPTCHA berhasil diselesaikan, lalu dipakai untuk mengisi setiap
+    konteks browser baru agar CAPTCHA tidak muncul lagi di setiap worker.
+    File yang lebih tua dari browser.storage_state_max_age_hours dianggap basi.
+    """
+
+    @staticmethod
+    def path() -> Optional[str]:
+        path = DEFAULT_CONFIG.browser.storage_state_path
+        return os.path.abspath(path) if path else None
+
+    @staticmethod
+    def is_stale() -> bool:
+        path = StorageState.path()
+        if not path or not os.path.exists(path):
+            return True
+        age_hours = (time.time() - os.path.getmtime(path)) / 3600
+        return age_hours > DEFAULT_CONFIG.browser.storage_state_max_age_hours
+
+    @staticmethod
+    def load() -> Optional[dict]:
+        """Membaca storage state, None jika nonaktif, belum ada, atau basi"""
+        path = StorageState.path()
+        if not path or not os.path.exists(path):
+            return None
+        if StorageState.is_stale():
+            logging.info("🍪⠀Storage state sudah basi, tidak dipakai")
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"[WARNING] Gagal membaca storage state {path}: {str(e)}")
+            return None
+
+    @staticmethod
+    def _write(state: dict):
+        path = StorageState.path()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # File sementara per proses, karena beberapa worker bisa menyimpan bersamaan
+        temp_path = f"{path}.{os.getpid()}.part"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(temp_path, path)
+        logging.info(
+            f"🍪⠀Storage state disimpan ({len(state.get('cookies', []))} cookie)"
+        )
+
+    @staticmethod
+    def save(context):
+        """Mengekspor storage state konteks; kegagalan hanya dicatat"""
+        if not StorageState.path() or context is None:
+            return
+        try:
+            StorageState._write(context.storage_state())
+        except Exception as e:
+            logging.warning(f"[WARNING] Gagal menyimpan storage state: {str(e)}")
+
+    @staticmethod
+    async def save_async(context):
+        if not StorageState.path() or context is None:
+            return
+        try:
+            StorageState._write(await context.storage_state())
+        except Exception as e:
+            logging.warning(f"[WARNING] Gagal menyimpan storage state: {str(e)}")
+
+    @staticmethod
+    def init_script(state: dict) -> Optional[str]:
+        origins = [o for o in state.get("origins", []) if o.get("localStorage")]
+        if not origins:
+            return None
+        return f"({LOCAL_STORAGE_SEED_JS})({json.dumps(origins)})"
+
+    @staticmethod
+    def seed(context):
+        """Mengisi konteks baru dengan cookies/localStorage dari storage state"""
+        state = StorageState.load()
+        if not state:
+            return
+        try:
+            if state.get("cookies"):
+                context.add_cookies(state["cookies"])
+            script = StorageState.init_script(state)
+            if script:
+                context.add_init_script(script=script)
+            logging.info(
+                f"🍪⠀Konteks diisi dari storage state ({len(state.get('cookies', []))} cookie)"
+            )
+        except Exception as e:
+            logging.warning(f"[WARNING] Gagal memuat storage state: {str(e)}")
+
+    @staticmethod
+    async def seed_async(context):
+        state = StorageState.load()
+        if not state:
+            return
+        try:
+            if state.get("cookies"):
+                await context.add_cookies(state["cookies"])
+            script = StorageState.init_script(state)
+            if script:
+                await context.add_init_script(script=script)
+            logging.info(
+                f"🍪⠀Konteks diisi dari storage state ({len(state.get('cookies', []))} cookie)"
+            )
+        except Exception as e:
+            logging.warning(f"[WARNING] Gagal memuat storage state: {str(e)}")
+
 
 class BrowserManager:
     """
@@ -19,6 +196,7 @@ class BrowserManager:
         self.extensions = DEFAULT_CONFIG.extensions
         self.context = None
         self.playwright = None
+        self.blocker = ResourceBlocker() if DEFAULT_CONFIG.blocking.enabled else None
 
     def __enter__(self):
         self.playwright = sync_playwright().start()
@@ -30,40 +208,52 @@ class BrowserManager:
         if self.playwright:
             self.playwright.stop()
 
-    def launch_browser(self):
-        try:
-            # --- MULAI BLOK KODE YANG DIPERBAIKI ---
-            # Mengambil path ekstensi dari konfigurasi yang dimuat (config.yaml)
-            extension_paths = [
-                os.path.abspath(path)
-                for path in self.extensions.paths
-                if os.path.exists(os.path.abspath(path))
-            ]
-
-            # Memberi peringatan jika path di config.yaml ada tapi tidak ditemukan di sistem
-            if not extension_paths and self.extensions.paths:
-                logging.warning(
-                    f"[WARNING] Path ekstensi yang dikonfigurasi di 'config.yaml' tidak dapat ditemukan: {self.extensions.paths}"
-                )
+    def get_launch_options(self) -> dict:
+        """Menyusun argumen launch_persistent_context dari config.yaml"""
+        # Mengambil path ekstensi dari konfigurasi yang dimuat (config.yaml)
+        extension_paths = [
+            os.path.abspath(path)
+            for path in self.extensions.paths
+            if os.path.exists(os.path.abspath(path))
+        ]
+
+        # Memberi peringatan jika path di config.yaml ada tapi tidak ditemukan di sistem
+        if not extension_paths and self.extensions.paths:
+            logging.warning(
+                f"[WARNING] Path ekstensi yang dikonfigurasi di 'config.yaml' tidak dapat ditemukan: {self.extensions.paths}"
+            )
+
+        # Ekstensi tidak stabil di mode headless, pemblokiran bawaan yang dipakai
+        if extension_paths and self.config.headless:
+            logging.info("🧩⠀Mode headless: ekstensi tidak dimuat")
+            extension_paths = []
+
+        extensions_to_load_str = ",".join(extension_paths)
 
-            extensions_to_load_str = ",".join(extension_paths)
+        # Salin argumen dasar dari config
+        all_args = self.config.args.copy()
 
-            # Salin argumen dasar dari config
-            all_args = self.config.args.copy()
+        # Jika ada ekstensi yang valid, tambahkan argumen yang diperlukan ke browser
+        if extension_paths:
+            all_args.append(f"--disable-extensions-except={extensions_to_load_str}")
+            all_args.append(f"--load-extension={extensions_to_load_str}")
 
-            # Jika ada ekstensi yang valid, tambahkan argumen yang diperlukan ke browser
-            if extension_paths:
-                all_args.append(f"--disable-extensions-except={extensions_to_load_str}")
-                all_args.append(f"--load-extension={extensions_to_load_str}")
-            # --- SELESAI BLOK KODE YANG DIPERBAIKI ---
+        return {
+            "user_data_dir": self.config.user_data_dir,
+            "headless": self.config.headless,
+            "viewport": {"width": 500, "height": 650},
+            "args": all_args,
+            "ignore_default_args": self.config.ignore_default_args,
+        }
 
+    def launch_browser(self):
+        try:
             self.context = self.playwright.chromium.launch_persistent_context(
-                user_data_dir=self.config.user_data_dir,
-                headless=self.config.headless,
-                viewport={"width": 500, "height": 650},
-                args=all_args,
-                ignore_default_args=self.config.ignore_default_args,
+                **self.get_launch_options()
             )
+            if self.blocker:
+                self.context.route("**/*", self.blocker.handle_route)
+            StorageState.seed(self.context)
             return self.context
         except Exception as e:
             logging.error(f"[ERROR] Gagal membuka browser: {str(e)}")
@@ -71,6 +261,9 @@ class BrowserManager:
 
     def close_browser(self):
         if self.context:
+            # Cookie yang diperbarui selama sesi ikut disimpan jika file sudah basi
+            if StorageState.is_stale():
+                StorageState.save(self.context)
             try:
                 self.context.close()
             except Exception as e:
@@ -88,3 +281,123 @@ class BrowserManager:
             else:
                 main_pages.append(page)
         return main_pages
+
+
+class BrowserSession:
+    """
+    Sesi browser untuk satu kali run: satu konteks persisten dibuka di awal,
+    setiap URL mendapat halaman baru, dan Chromium di-restart setelah
+    sejumlah container (browser.restart_after) atau ketika crash.
+    """
+
+    def __init__(self, restart_after: Optional[int] = None):
+        self.restart_after = (
+            DEFAULT_CONFIG.browser.restart_after
+            if restart_after is None
+            else restart_after
+        )
+        self.manager: Optional[BrowserManager] = None
+        self.containers_served = 0
+        self._crashed = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def context(self):
+        return self.manager.context if self.manager else None
+
+    def start(self):
+        manager = BrowserManager()
+        try:
+            manager.__enter__()
+        except Exception:
+            manager.__exit__(None, None, None)
+            raise
+        self.manager = manager
+        self.containers_served = 0
+        self._crashed = False
+        manager.context.on("close", self._mark_crashed)
+
+    def stop(self):
+        manager, self.manager = self.manager, None
+        if manager:
+            manager.__exit__(None, None, None)
+
+    def restart(self):
+        logging.info("♻⠀Me-restart browser...")
+        self.stop()
+        self.start()
+
+    def _mark_crashed(self, *_):
+        self._crashed = True
+
+    @property
+    def crashed(self) -> bool:
+        return self._crashed
+
+    @property
+    def needs_restart(self) -> bool:
+        """True jika konteks crash atau batas restart_after sudah tercapai"""
+        if self.manager is None or self._crashed:
+            return True
+        return bool(
+            self.restart_after and self.containers_served >= self.restart_after
+        )
+
+    def mark_container_done(self):
+        """Mencatat satu container selesai diproses untuk hitungan restart_after"""
+        self.containers_served += 1
+
+    def can_defer_restart(self) -> bool:
+        """True jika restart hanya karena restart_after dan konteks masih hidup"""
+        return self.manager is not None and not self._crashed
+
+    def new_page(self, defer_restart: bool = False) -> Page:
+        """
+        Membuka halaman baru untuk satu container, me-restart browser lebih dulu
+        jika konteks sudah crash atau batas restart_after tercapai. Dengan
+        defer_restart (ada tab yang diparkir), restart karena restart_after
+        ditunda dan halaman dibuka di konteks yang masih hidup.
+        """
+        if self.needs_restart and not (defer_restart and self.can_defer_restart()):
+            if self._crashed and self.manager is not None:
+                logging.warning("[WARNING] Browser crash terdeteksi, membuka ulang")
+            elif self.manager is not None:
+                logging.info(
+                    f"♻⠀Batas {self.restart_after} container tercapai, browser di-restart"
+                )
+            self.restart()
+
+        for attempt in range(3):
+            try:
+                page = self.manager.context.new_page()
+                page.on("crash", self._mark_crashed)
+                return page
+            except Exception as e:
+                logging.warning(
+                    f"[WARNING] Gagal membuka halaman baru, mencoba lagi ({attempt + 1}/3): {str(e)}"
+                )
+                self.restart()
+        raise RuntimeError("Gagal membuka halaman baru setelah 3 percobaan")
+
+    def release_page(self, page: Optional[Page]):
+        """
+        Menutup halaman milik satu container. Halaman terakhir di konteks
+        hanya dikosongkan agar jendela browser tetap hidup untuk URL berikutnya.
+        """
+        if page is None or self._crashed:
+            return
+        try:
+            if page.is_closed():
+                return
+            if len(self.manager.context.pages) > 1:
+                page.close()
+            else:
+                page.goto("about:blank")
+        except Exception as e:
+            logging.warning(f"[WARNING] Gagal menutup halaman: {str(e)}")
@@ -0,0 +1,66 @@
+"""
+Modul untuk mengelola koneksi SQLite yang dipakai bersama
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict
+from config import DEFAULT_CONFIG
+
+# Koneksi disimpan per thread; pid ikut dicatat karena koneksi SQLite
+# tidak boleh dipakai ulang oleh proses hasil fork
+_local = threading.local()
+
+
+def _open_connection(db_path: str) -> sqlite3.Connection:
+    """Membuka koneksi baru dengan WAL dan pragma yang sudah disetel"""
+    config = DEFAULT_CONFIG.database
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(
+        db_path,
+        timeout=config.busy_timeout,
+        cached_statements=config.cached_statements,
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA mmap_size={int(config.mmap_size)}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    logging.debug(f"[SQLITE] Koneksi baru ke {db_path} (pid {os.getpid()})")
+    return conn
+
+
+def _connections() -> Dict[str, sqlite3.Connection]:
+    if getattr(_local, "pid", None) != os.getpid():
+        _local.pid = os.getpid()
+        _local.connections = {}
+    return _local.connections
+
+
+def get_connection(db_path: str) -> sqlite3.Connection:
+    """
+    Mengambil koneksi long-lived untuk db_path milik thread/proses saat ini.
+    Koneksi tidak perlu (dan tidak boleh) ditutup oleh pemanggil.
+    """
+    connections = _connections()
+    key = os.path.abspath(db_path)
+    conn = connections.get(key)
+    if conn is None:
+        conn = _open_connection(db_path)
+        connections[key] = conn
+    return conn
+
+
+def close_connections():
+    """Menutup semua koneksi milik thread saat ini"""
+    connections = _connections()
+    for conn in connections.values():
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logging.debug(f"[SQLITE] Gagal menutup koneksi: {str(e)}")
+    connections.clear()
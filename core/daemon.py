@@ -0,0 +1,124 @@
+"""
+Modul daemon yang memproses antrian job dengan satu browser yang tetap hidup
+"""
+
+import logging
+import time
+from typing import Optional
+from config import DEFAULT_CONFIG
+from models.data_models import ContainerResult, Job
+from .browser import BrowserSession
+from .database import DatabaseHandler
+from .job_queue import JobQueue, worker_name
+from .runner import scrape_container
+from .scraper import FileCryptScraper
+
+
+class JobDaemon:
+    """
+    Mengambil job dari tabel jobs satu per satu dan men-scrape-nya dengan
+    BrowserSession yang sama, sehingga proses Python dan Chromium tidak
+    dibuka ulang untuk setiap daftar URL. Status, durasi dan jumlah baris
+    setiap job dicatat di tabel jobs.
+    """
+
+    def __init__(
+        self,
+        session: BrowserSession,
+        poll_interval: Optional[float] = None,
+        exit_when_empty: bool = False,
+        refresh: Optional[bool] = None,
+    ):
+        self.session = session
+        self.poll_interval = (
+            DEFAULT_CONFIG.daemon.poll_interval
+            if poll_interval is None
+            else poll_interval
+        )
+        self.exit_when_empty = exit_when_empty
+        self.refresh = refresh
+        self.worker = worker_name()
+        self.processed = 0
+        self.failed = 0
+
+    def _scrape(self, job: Job) -> ContainerResult:
+        page = self.session.new_page()
+        try:
+            # Job dari enqueue --stale selalu di-refresh
+            scraper = FileCryptScraper(page, True if job.refresh else self.refresh)
+            for attempt in range(3):
+                try:
+                    page.goto(job.url, wait_until="load", timeout=15000)
+                    break
+                except Exception as e:
+                    logging.warning(
+                        f"[WARNING] Gagal memuat URL, mencoba lagi ({attempt + 1}/3): {str(e)}"
+                    )
+                    time.sleep(2)
+            else:
+                raise RuntimeError("Gagal memuat URL setelah 3 percobaan")
+            self.session.manager.close_about_blank_tabs()
+            return scrape_container(scraper, job.url, job.provider)
+        finally:
+            self.session.release_page(page)
+            self.session.mark_container_done()
+
+    def process(self, job: Job) -> bool:
+        """Memproses satu job dan mencatat hasilnya, True jika berhasil"""
+        logging.info(
+            f"⚙⠀ [JOB {job.id}] Memproses {job.url} (percobaan {job.attempts})"
+        )
+        started = time.perf_counter()
+        try:
+            result = self._scrape(job)
+            if result.unchanged:
+                DatabaseHandler.touch_container(result.target_code)
+                JobQueue.complete(job.id, 0, 0, time.perf_counter() - started)
+                logging.info(f"⏭⠀[JOB {job.id}] {result.target_code} tidak berubah")
+                return True
+            if not result.data:
+                raise RuntimeError("Tidak ada data yang berhasil di-scrape")
+            new_rows = DatabaseHandler.save_result(result)
+        except Exception as e:
+            status = JobQueue.fail(job.id, str(e), time.perf_counter() - started)
+            logging.error(f"❌⠀ [JOB {job.id}] Gagal ({status}): {str(e)}")
+            return False
+
+        seconds = time.perf_counter() - started
+        JobQueue.complete(job.id, len(result.data), new_rows, seconds)
+        logging.info(
+            f"✅⠀[JOB {job.id}] {result.target_code}: {len(result.data)} item, "
+            f"{new_rows} baru ({seconds:.1f}s)"
+        )
+        return True
+
+    def run(self) -> int:
+        """Loop utama daemon; berhenti dengan Ctrl+C. Mengembalikan jumlah job diproses"""
+        requeued = JobQueue.requeue_running(self.worker)
+        if requeued:
+            logging.warning(
+                f"[WARNING] {requeued} job running dari daemon sebelumnya dikembalikan ke antrian"
+            )
+        logging.info(f"⚙⠀ Daemon {self.worker} menunggu job...")
+
+        job = None
+        try:
+            while True:
+                job = JobQueue.claim(self.worker)
+                if job is None:
+                    if self.exit_when_empty:
+                        break
+                    time.sleep(self.poll_interval)
+                    continue
+                if not self.process(job):
+                    self.failed += 1
+                self.processed += 1
+                job = None
+        except KeyboardInterrupt:
+            logging.info("⚙⠀ Daemon dihentikan")
+            if job is not None:
+                JobQueue.release(job.id)
+        logging.info(
+            f"⚙⠀ Daemon selesai: {self.processed} job diproses, {self.failed} gagal"
+        )
+        return self.processed
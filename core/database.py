@@ -5,11 +5,97 @@ Modul untuk menangani penyimpanan data ke SQLite dan export ke Excel
 import sqlite3
 import logging
 import os
-from typing import List
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Alignment
-from openpyxl.worksheet.worksheet import Worksheet
-from models.data_models import ScrapedData
+from typing import Dict, List, Optional, Set, Tuple
+from models.data_models import (
+    BulkWriteResult,
+    ContainerInfo,
+    ContainerResult,
+    ScrapedData,
+)
+from config import DEFAULT_CONFIG
+from .connection import get_connection
+from .excel_exporter import ExcelExporter
+from .migrations import migrate
+from .utils import make_item_key
+
+CONTAINER_COLUMNS = (
+    "target_code, title, episode_count, providers, "
+    "first_scraped_at, last_scraped_at, row_count, fingerprint, url"
+)
+
+
+def bulk_insert(
+    conn: sqlite3.Connection, table: str, data: List[ScrapedData]
+) -> BulkWriteResult:
+    """
+    Upsert massal dengan executemany dalam satu transaksi.
+
+    Key yang sudah ada dibaca di dalam transaksi yang sama (BEGIN IMMEDIATE),
+    sehingga pembagian baru/duplikat tetap akurat walau ada penulis lain.
+    Baris yang sudah ada hanya diperbarui jika link-nya baru saja di-resolve
+    (item.resolved) dan tidak ERROR; resolved_at ikut diperbarui.
+    """
+    result = BulkWriteResult()
+    if not data:
+        return result
+
+    rows = [
+        {
+            "title": item.title,
+            "provider": item.provider,
+            "size": item.size,
+            "status": item.status,
+            "download_url": item.download_url,
+            "bypass_url": item.bypass_url,
+            "target_code": item.target_code,
+            "fresh": int(item.resolved and item.download_url != "ERROR"),
+        }
+        for item in data
+    ]
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        existing = set()
+        for target_code in {row["target_code"] for row in rows}:
+            existing.update(
+                make_item_key(*key)
+                for key in conn.execute(
+                    f"SELECT title, provider, target_code FROM {table} WHERE target_code = ?",
+                    (target_code,),
+                )
+            )
+        seen = set(existing)
+        updated = set()
+        for row in rows:
+            key = make_item_key(row["title"], row["provider"], row["target_code"])
+            # NULL di primary key selalu dianggap berbeda oleh SQLite
+            if key in seen and None not in key:
+                result.duplicate_keys.append(key)
+                # Duplikat di dalam batch yang sama bukan baris lama yang diperbarui
+                if row["fresh"] and key in existing and key not in updated:
+                    result.updated_keys.append(key)
+                    updated.add(key)
+            else:
+                result.new_keys.append(key)
+                seen.add(key)
+        conn.executemany(
+            f"""
+            INSERT INTO {table}
+            (title, provider, size, status, download_url, bypass_url, target_code, resolved_at)
+            VALUES (
+                :title, :provider, :size, :status, :download_url, :bypass_url, :target_code,
+                CASE WHEN :download_url = 'ERROR' THEN NULL ELSE CURRENT_TIMESTAMP END
+            )
+            ON CONFLICT (title, provider, target_code) DO UPDATE SET
+                size = excluded.size,
+                status = excluded.status,
+                download_url = excluded.download_url,
+                bypass_url = excluded.bypass_url,
+                resolved_at = excluded.resolved_at
+            WHERE :fresh
+            """,
+            rows,
+        )
+    return result
 
 
 class DatabaseHandler:
@@ -17,85 +103,86 @@ class DatabaseHandler:
 
     DB_PATH = os.path.join("results", "scraped_data.db")
 
+    _schema_ready = False
+
+    @staticmethod
+    def _connect() -> sqlite3.Connection:
+        """Koneksi bersama untuk thread ini, skema disiapkan sekali per proses"""
+        conn = get_connection(DatabaseHandler.DB_PATH)
+        if not DatabaseHandler._schema_ready:
+            DatabaseHandler._create_schema(conn)
+        return conn
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection):
+        migrate(conn)
+        DatabaseHandler._schema_ready = True
+
     @staticmethod
     def _init_db():
         """Inisialisasi database SQLite"""
-        os.makedirs("results", exist_ok=True)
-        conn = sqlite3.connect(DatabaseHandler.DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS scraped_data (
-                title TEXT,
-                provider TEXT,
-                size TEXT,
-                status TEXT,
-                download_url TEXT,
-                bypass_url TEXT,
-                target_code TEXT,
-                PRIMARY KEY (title, provider, target_code)
-            )
-            """
+        DatabaseHandler._connect()
+
+    @staticmethod
+    def _to_scraped_data(row: tuple) -> ScrapedData:
+        return ScrapedData(
+            title=row[0],
+            provider=row[1],
+            size=row[2],
+            status=row[3],
+            download_url=row[4],
+            bypass_url=row[5],
+            target_code=row[6],
+            container_title=row[7] if len(row) > 7 and row[7] else "N/A",
         )
-        conn.commit()
-        conn.close()
+
+    @staticmethod
+    def _to_container_info(row: tuple) -> ContainerInfo:
+        return ContainerInfo(
+            target_code=row[0],
+            title=row[1],
+            episode_count=row[2],
+            providers=row[3].split(",") if row[3] else [],
+            first_scraped_at=row[4],
+            last_scraped_at=row[5],
+            row_count=row[6] or 0,
+            fingerprint=row[7],
+            url=row[8],
+        )
+
+    @staticmethod
+    def save_bulk(data: List[ScrapedData]) -> BulkWriteResult:
+        """Menyimpan data dalam satu transaksi dan mengembalikan key baru/duplikat"""
+        return bulk_insert(DatabaseHandler._connect(), "scraped_data", data)
 
     @staticmethod
     def save_to_sqlite(data: List[ScrapedData]) -> int:
         """Menyimpan data ke SQLite dan mengembalikan jumlah item baru"""
-        DatabaseHandler._init_db()
-        conn = sqlite3.connect(DatabaseHandler.DB_PATH)
-        cursor = conn.cursor()
-        new_items = 0
-
-        for item in data:
-            cursor.execute(
-                """
-                INSERT OR IGNORE INTO scraped_data
-                (title, provider, size, status, download_url, bypass_url, target_code)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    item.title,
-                    item.provider,
-                    item.size,
-                    item.status,
-                    item.download_url,
-                    item.bypass_url,
-                    item.target_code,
-                ),
+        result = DatabaseHandler.save_bulk(data)
+        if result.new_count > 0:
+            logging.info(
+                f"📥⠀Disimpan {result.new_count} item ke database ({result.duplicate_count} sudah ada)"
             )
-            if cursor.rowcount > 0:
-                new_items += 1
-
-        conn.commit()
-        conn.close()
-        if new_items > 0:
-            logging.info(f"📥⠀Disimpan {new_items} item ke database")
-        return new_items
+        if result.updated_count > 0:
+            logging.info(f"🔄⠀Diperbarui {result.updated_count} link kedaluwarsa")
+        return result.new_count
 
     @staticmethod
     def is_data_exists(title: str, provider: str, target_code: str) -> bool:
-        conn = sqlite3.connect(DatabaseHandler.DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
+        cursor = DatabaseHandler._connect().execute(
             """
             SELECT 1 FROM scraped_data
             WHERE title = ? AND provider = ? AND target_code = ?
             """,
             (title, provider, target_code),
         )
-        exists = cursor.fetchone() is not None
-        conn.close()
-        return exists
+        return cursor.fetchone() is not None
 
     @staticmethod
     def get_data_by_title_provider(
         title: str, provider: str, target_code: str
     ) -> ScrapedData | None:
-        conn = sqlite3.connect(DatabaseHandler.DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
+        cursor = DatabaseHandler._connect().execute(
             """
             SELECT title, provider, size, status, download_url, bypass_url, target_code
             FROM scraped_data
@@ -104,296 +191,201 @@ class DatabaseHandler:
             (title, provider, target_code),
         )
         row = cursor.fetchone()
-        conn.close()
-        if row:
-            return ScrapedData(
-                title=row[0],
-                provider=row[1],
-                size=row[2],
-                status=row[3],
-                download_url=row[4],
-                bypass_url=row[5],
-                target_code=row[6],
-                container_title="N/A",
-            )
-        return None
+        return DatabaseHandler._to_scraped_data(row) if row else None
 
     @staticmethod
     def get_all_data() -> List[ScrapedData]:
-        conn = sqlite3.connect(DatabaseHandler.DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
+        cursor = DatabaseHandler._connect().execute(
             """
             SELECT title, provider, size, status, download_url, bypass_url, target_code
             FROM scraped_data
             """
         )
-        rows = cursor.fetchall()
-        conn.close()
-        return [
-            ScrapedData(
-                title=row[0],
-                provider=row[1],
-                size=row[2],
-                status=row[3],
-                download_url=row[4],
-                bypass_url=row[5],
-                target_code=row[6],
-                container_title="N/A",
-            )
-            for row in rows
-        ]
+        return [DatabaseHandler._to_scraped_data(row) for row in cursor]
 
     @staticmethod
     def get_data_by_target_code(target_code: str) -> List[ScrapedData]:
-        conn = sqlite3.connect(DatabaseHandler.DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
+        cursor = DatabaseHandler._connect().execute(
             """
-            SELECT title, provider, size, status, download_url, bypass_url, target_code
-            FROM scraped_data
-            WHERE target_code = ?
+            SELECT s.title, s.provider, s.size, s.status, s.download_url,
+                   s.bypass_url, s.target_code, c.title
+            FROM scraped_data s
+            LEFT JOIN containers c ON c.target_code = s.target_code
+            WHERE s.target_code = ?
             """,
             (target_code,),
         )
-        rows = cursor.fetchall()
-        conn.close()
-        return [
-            ScrapedData(
-                title=row[0],
-                provider=row[1],
-                size=row[2],
-                status=row[3],
-                download_url=row[4],
-                bypass_url=row[5],
-                target_code=row[6],
-                container_title="N/A",
-            )
-            for row in rows
-        ]
+        return [DatabaseHandler._to_scraped_data(row) for row in cursor]
 
     @staticmethod
-    def _is_sheet_empty(sheet: Worksheet) -> bool:
-        return sheet.max_row <= 1
+    def save_result(result: ContainerResult) -> int:
+        """Menyimpan data satu container beserta metadatanya"""
+        new_items = DatabaseHandler.save_to_sqlite(result.data)
+        DatabaseHandler.upsert_container(result)
+        return new_items
 
     @staticmethod
-    def export_to_excel(data: List[ScrapedData], target_code: str):
-        """Export data ke file Excel RESULT_DATABASE.xlsx"""
-        if not data and not target_code:
-            return
+    def upsert_container(result: ContainerResult):
+        """
+        Menyimpan metadata container setelah datanya disimpan. Jumlah baris dan
+        daftar provider dihitung dari index (target_code, provider).
+        """
+        title = result.container_title
+        if not title or title == result.target_code:
+            title = None
+        conn = DatabaseHandler._connect()
+        with conn:
+            conn.execute(
+                """
+                INSERT INTO containers
+                    (target_code, title, episode_count, providers, row_count, fingerprint, url)
+                SELECT ?, ?, ?, GROUP_CONCAT(provider), COALESCE(SUM(n), 0), ?, ?
+                FROM (
+                    SELECT provider, COUNT(*) AS n FROM scraped_data
+                    WHERE target_code = ? GROUP BY provider
+                )
+                WHERE true
+                ON CONFLICT (target_code) DO UPDATE SET
+                    title = COALESCE(excluded.title, containers.title),
+                    episode_count = COALESCE(excluded.episode_count, containers.episode_count),
+                    providers = excluded.providers,
+                    row_count = excluded.row_count,
+                    fingerprint = excluded.fingerprint,
+                    url = COALESCE(excluded.url, containers.url),
+                    last_scraped_at = CURRENT_TIMESTAMP
+                """,
+                (
+                    result.target_code,
+                    title,
+                    result.episode_count,
+                    result.fingerprint,
+                    result.url,
+                    result.target_code,
+                ),
+            )
 
-        os.makedirs("results", exist_ok=True)
-        filename = os.path.join("results", "RESULT_DATABASE.xlsx")
-        relevant_data = DatabaseHandler.get_data_by_target_code(target_code)
-        combined_data = relevant_data[:]
-        input_keys = {
-            (
-                item.title.lower().strip(),
-                item.provider.lower().strip(),
-                item.target_code.lower().strip(),
+    @staticmethod
+    def touch_container(target_code: str):
+        """Memperbarui waktu scrape container yang tidak berubah"""
+        conn = DatabaseHandler._connect()
+        with conn:
+            conn.execute(
+                "UPDATE containers SET last_scraped_at = CURRENT_TIMESTAMP WHERE target_code = ?",
+                (target_code,),
             )
-            for item in data
+
+    @staticmethod
+    def get_container(target_code: str) -> Optional[ContainerInfo]:
+        cursor = DatabaseHandler._connect().execute(
+            f"SELECT {CONTAINER_COLUMNS} FROM containers WHERE target_code = ?",
+            (target_code,),
+        )
+        row = cursor.fetchone()
+        return DatabaseHandler._to_container_info(row) if row else None
+
+    @staticmethod
+    def get_containers() -> List[ContainerInfo]:
+        cursor = DatabaseHandler._connect().execute(
+            f"SELECT {CONTAINER_COLUMNS} FROM containers ORDER BY target_code"
+        )
+        return [DatabaseHandler._to_container_info(row) for row in cursor]
+
+    @staticmethod
+    def get_known_records(
+        target_code: str,
+    ) -> Dict[Tuple[str, str, str], ScrapedData]:
+        """
+        Memuat semua record satu target_code dalam satu query, diindeks dengan
+        make_item_key untuk pengecekan baris di memori
+        """
+        return {
+            make_item_key(item.title, item.provider, item.target_code): item
+            for item in DatabaseHandler.get_data_by_target_code(target_code)
         }
 
-        for item in data:
-            item_key = (
-                item.title.lower().strip(),
-                item.provider.lower().strip(),
-                item.target_code.lower().strip(),
-            )
-            if item_key not in {
-                (
-                    d.title.lower().strip(),
-                    d.provider.lower().strip(),
-                    d.target_code.lower().strip(),
-                )
-                for d in relevant_data
-            }:
-                combined_data.append(item)
+    @staticmethod
+    def _stale_query(columns: str, where: str) -> str:
+        """
+        Query baris kedaluwarsa (resolved_at NULL atau lebih tua dari TTL).
+        Dipecah jadi UNION supaya kedua cabang memakai range index resolved_at;
+        parameter `where` dipakai dua kali, diikuti modifier TTL.
+        """
+        return f"""
+            SELECT {columns} FROM scraped_data
+            WHERE {where} AND resolved_at IS NULL
+            UNION
+            SELECT {columns} FROM scraped_data
+            WHERE {where} AND resolved_at < datetime('now', ?)
+        """
 
-        if not combined_data:
-            return
+    @staticmethod
+    def _ttl_modifier(provider: str) -> str:
+        hours = DEFAULT_CONFIG.freshness.ttl_for(provider)
+        return f"-{float(hours)} hours"
 
-        try:
-            if os.path.exists(filename):
-                wb = load_workbook(filename)
-                for sheet_name in wb.sheetnames[:]:
-                    sheet = wb[sheet_name]
-                    if (
-                        DatabaseHandler._is_sheet_empty(sheet)
-                        or sheet_name.lower() == "sheet"
-                    ):
-                        wb.remove(sheet)
-            else:
-                wb = Workbook()
-                wb.remove(wb.active)
-
-            all_sheet_name = "ALL_PROVIDER_RESULTS"
-            if all_sheet_name not in wb.sheetnames:
-                all_sheet = wb.create_sheet(all_sheet_name, 0)
-                all_sheet.append(
-                    [
-                        "No",
-                        "Title",
-                        "Provider",
-                        "Size",
-                        "Status",
-                        "Download URL",
-                        "Bypass URL",
-                        "_target_code",
-                    ]
+    @staticmethod
+    def get_stale_keys(target_code: str) -> Set[Tuple[str, str, str]]:
+        """
+        Key (make_item_key) baris satu container yang link-nya sudah melewati
+        TTL provider-nya, dicari lewat index (target_code, provider, resolved_at)
+        """
+        conn = DatabaseHandler._connect()
+        providers = [
+            row[0]
+            for row in conn.execute(
+                "SELECT DISTINCT provider FROM scraped_data WHERE target_code = ?",
+                (target_code,),
+            )
+        ]
+        stale = set()
+        for provider in providers:
+            stale.update(
+                make_item_key(*key)
+                for key in conn.execute(
+                    DatabaseHandler._stale_query(
+                        "title, provider, target_code",
+                        "target_code = ? AND provider = ?",
+                    ),
+                    (
+                        target_code,
+                        provider,
+                        target_code,
+                        provider,
+                        DatabaseHandler._ttl_modifier(provider),
+                    ),
                 )
-            else:
-                all_sheet = wb[all_sheet_name]
-
-            existing_all_entries = set()
-            for row in all_sheet.iter_rows(min_row=2, values_only=True):
-                if row[1] and row[2] and row[7]:
-                    existing_all_entries.add(
-                        (
-                            str(row[1]).lower().strip(),
-                            str(row[2]).lower().strip(),
-                            str(row[7]).lower().strip(),
-                        )
-                    )
-
-            new_all_items = 0
-            for item in combined_data:
-                item_key = (
-                    item.title.lower().strip(),
-                    item.provider.lower().strip(),
-                    item.target_code.lower().strip(),
+            )
+        return stale
+
+    @staticmethod
+    def get_stale_containers() -> List[ContainerInfo]:
+        """Container yang punya setidaknya satu baris kedaluwarsa"""
+        conn = DatabaseHandler._connect()
+        # Daftar provider dari tabel containers yang kecil, bukan scan scraped_data
+        providers = set()
+        for (names,) in conn.execute("SELECT providers FROM containers"):
+            providers.update(name for name in (names or "").split(",") if name)
+        target_codes = set()
+        for provider in providers:
+            target_codes.update(
+                row[0]
+                for row in conn.execute(
+                    DatabaseHandler._stale_query("target_code", "provider = ?"),
+                    (provider, provider, DatabaseHandler._ttl_modifier(provider)),
                 )
-                if item_key not in existing_all_entries:
-                    all_sheet.append(
-                        [
-                            all_sheet.max_row,
-                            item.title,
-                            item.provider,
-                            item.size,
-                            item.status,
-                            item.download_url,
-                            item.bypass_url,
-                            item.target_code,
-                        ]
-                    )
-                    existing_all_entries.add(item_key)
-                    new_all_items += 1
-
-            for idx, row in enumerate(all_sheet.iter_rows(min_row=2), 1):
-                row[0].value = idx
-
-            if DatabaseHandler._is_sheet_empty(all_sheet):
-                wb.remove(all_sheet)
-
-            providers = {item.provider for item in combined_data}
-            for provider in providers:
-                provider_items = [
-                    item for item in combined_data if item.provider == provider
-                ]
-                provider_new_items = False
-                existing_provider_entries = set()
-                provider_sheet_name = provider[:31]
-                if provider_sheet_name in wb.sheetnames:
-                    provider_sheet = wb[provider_sheet_name]
-                    for row in provider_sheet.iter_rows(min_row=2, values_only=True):
-                        if row[1] and row[2] and row[7]:
-                            existing_provider_entries.add(
-                                (
-                                    str(row[1]).lower().strip(),
-                                    str(row[2]).lower().strip(),
-                                    str(row[7]).lower().strip(),
-                                )
-                            )
-
-                for item in provider_items:
-                    item_key = (
-                        item.title.lower().strip(),
-                        item.provider.lower().strip(),
-                        item.target_code.lower().strip(),
-                    )
-                    if item_key not in existing_provider_entries:
-                        provider_new_items = True
-                        break
-
-                if provider_new_items:
-                    if provider_sheet_name not in wb.sheetnames:
-                        provider_sheet = wb.create_sheet(provider_sheet_name)
-                        provider_sheet.append(
-                            [
-                                "No",
-                                "Title",
-                                "Provider",
-                                "Size",
-                                "Status",
-                                "Download URL",
-                                "Bypass URL",
-                                "_target_code",
-                            ]
-                        )
-                    else:
-                        provider_sheet = wb[provider_sheet_name]
-
-                    for item in provider_items:
-                        item_key = (
-                            item.title.lower().strip(),
-                            item.provider.lower().strip(),
-                            item.target_code.lower().strip(),
-                        )
-                        if item_key not in existing_provider_entries:
-                            provider_sheet.append(
-                                [
-                                    provider_sheet.max_row,
-                                    item.title,
-                                    item.provider,
-                                    item.size,
-                                    item.status,
-                                    item.download_url,
-                                    item.bypass_url,
-                                    item.target_code,
-                                ]
-                            )
-                            existing_provider_entries.add(item_key)
-
-                    for idx, row in enumerate(provider_sheet.iter_rows(min_row=2), 1):
-                        row[0].value = idx
-
-                    if DatabaseHandler._is_sheet_empty(provider_sheet):
-                        wb.remove(provider_sheet)
-
-            has_data = False
-            for sheet_name in wb.sheetnames[:]:
-                sheet = wb[sheet_name]
-                if not DatabaseHandler._is_sheet_empty(sheet):
-                    has_data = True
-                else:
-                    wb.remove(sheet)
-
-            if not has_data or not wb.sheetnames:
-                return
-
-            if "Sheet" in wb.sheetnames:
-                wb.remove(wb["Sheet"])
-
-            for sheet in wb.sheetnames:
-                ws = wb[sheet]
-                column_widths = {
-                    "A": 5,
-                    "B": 60,
-                    "C": 15,
-                    "D": 10,
-                    "E": 15,
-                    "F": 60,
-                    "G": 60,
-                    "H": 15,
-                }
-                for col, width in column_widths.items():
-                    ws.column_dimensions[col].width = width
-                for row in ws.iter_rows():
-                    for cell in row:
-                        cell.alignment = Alignment(wrap_text=True, vertical="top")
-
-            wb.save(filename)
+            )
+        containers = (DatabaseHandler.get_container(code) for code in sorted(target_codes))
+        return [container for container in containers if container]
 
+    @staticmethod
+    def export_to_excel(data: List[ScrapedData] = None, target_code: str = None) -> int:
+        """
+        Export seluruh database ke RESULT_DATABASE.xlsx. Parameter lama tetap
+        diterima, tapi data selalu di-stream langsung dari SQLite.
+        """
+        filename = os.path.join("results", "RESULT_DATABASE.xlsx")
+        try:
+            return ExcelExporter.export(DatabaseHandler._connect(), filename)
         except Exception as e:
             logging.error(f"[ERROR] Gagal menyimpan Excel: {str(e)}")
+            return 0
@@ -0,0 +1,173 @@
+"""
+Modul untuk export data SQLite ke Excel secara streaming (openpyxl write-only)
+"""
+
+import logging
+import os
+import re
+import sqlite3
+from typing import Iterable, List, Optional, Set
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
+from .utils import normalize_provider
+
+HEADERS = [
+    "No",
+    "Title",
+    "Provider",
+    "Size",
+    "Status",
+    "Download URL",
+    "Bypass URL",
+    "_target_code",
+]
+COLUMN_WIDTHS = {
+    "A": 5,
+    "B": 60,
+    "C": 15,
+    "D": 10,
+    "E": 15,
+    "F": 60,
+    "G": 60,
+    "H": 15,
+}
+ALL_SHEET_NAME = "ALL_PROVIDER_RESULTS"
+ROW_COLUMNS = "title, provider, size, status, download_url, bypass_url, target_code"
+# Karakter yang ditolak Excel di nama sheet, dan batas panjangnya
+INVALID_SHEET_CHARS = re.compile(r"[/\\?*:\[\]]")
+MAX_SHEET_TITLE = 31
+
+# Satu objek style dipakai bersama semua sel, bukan Alignment baru per sel
+CELL_ALIGNMENT = Alignment(wrap_text=True, vertical="top")
+
+
+def select_rows(
+    conn: sqlite3.Connection,
+    target_code: Optional[str] = None,
+    provider: Optional[str] = None,
+) -> sqlite3.Cursor:
+    """
+    Cursor baris scraped_data (urutan simpan) untuk container/provider tertentu.
+    provider dinormalisasi seperti saat disimpan ("send" -> "Send").
+    """
+    conditions, params = [], []
+    if target_code:
+        conditions.append("target_code = ?")
+        params.append(target_code)
+    if provider:
+        conditions.append("provider = ? COLLATE NOCASE")
+        params.append(normalize_provider(provider))
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return conn.execute(
+        f"SELECT {ROW_COLUMNS} FROM scraped_data {where} ORDER BY rowid", params
+    )
+
+
+class ExcelExporter:
+    """
+    Menulis workbook langsung dari cursor SQLite: satu query dan satu pass per
+    sheet, tanpa memuat workbook lama atau seluruh data ke memori.
+    Database adalah sumber data lengkap, jadi file selalu ditulis ulang.
+    """
+
+    @staticmethod
+    def _create_sheet(wb: Workbook, title: str) -> WriteOnlyWorksheet:
+        ws = wb.create_sheet(title)
+        for col, width in COLUMN_WIDTHS.items():
+            ws.column_dimensions[col].width = width
+            ws.column_dimensions[col].alignment = CELL_ALIGNMENT
+        ws.append(ExcelExporter._styled_row(ws, HEADERS))
+        return ws
+
+    @staticmethod
+    def _sheet_title(provider: str, used: Set[str]) -> str:
+        """
+        Nama sheet valid untuk provider: karakter terlarang dibuang, dipotong
+        31 karakter, dan diberi akhiran ~2, ~3, ... jika bentrok (Excel tidak
+        membedakan huruf besar/kecil). used diperbarui dengan nama yang dipakai.
+        """
+        base = INVALID_SHEET_CHARS.sub("", provider).strip("' ") or "provider"
+        title = base[:MAX_SHEET_TITLE]
+        suffix = 2
+        while title.lower() in used:
+            tag = f"~{suffix}"
+            title = base[: MAX_SHEET_TITLE - len(tag)] + tag
+            suffix += 1
+        used.add(title.lower())
+        return title
+
+    @staticmethod
+    def _styled_row(ws: WriteOnlyWorksheet, values: Iterable) -> List[WriteOnlyCell]:
+        row = []
+        for value in values:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.alignment = CELL_ALIGNMENT
+            row.append(cell)
+        return row
+
+    @staticmethod
+    def _write_rows(ws: WriteOnlyWorksheet, rows: Iterable[tuple]) -> int:
+        count = 0
+        for count, row in enumerate(rows, 1):
+            ws.append(ExcelExporter._styled_row(ws, (count, *row)))
+        return count
+
+    @staticmethod
+    def _providers(conn: sqlite3.Connection, target_code: Optional[str]) -> List[str]:
+        if target_code:
+            cursor = conn.execute(
+                """
+                SELECT DISTINCT provider FROM scraped_data
+                WHERE target_code = ? ORDER BY provider
+                """,
+                (target_code,),
+            )
+        else:
+            cursor = conn.execute(
+                "SELECT DISTINCT provider FROM scraped_data ORDER BY provider"
+            )
+        return [row[0] for row in cursor if row[0]]
+
+    @staticmethod
+    def export(
+        conn: sqlite3.Connection, filename: str, target_code: Optional[str] = None
+    ) -> int:
+        """
+        Menulis sheet ALL_PROVIDER_RESULTS lalu satu sheet per provider untuk
+        satu target_code (atau seluruh database). Mengembalikan jumlah baris.
+        """
+        providers = ExcelExporter._providers(conn, target_code)
+        if not providers:
+            return 0
+
+        wb = Workbook(write_only=True)
+        total = ExcelExporter._write_rows(
+            ExcelExporter._create_sheet(wb, ALL_SHEET_NAME),
+            select_rows(conn, target_code),
+        )
+        used_titles = {ALL_SHEET_NAME.lower()}
+        for provider in providers:
+            ExcelExporter._write_rows(
+                ExcelExporter._create_sheet(
+                    wb, ExcelExporter._sheet_title(provider, used_titles)
+                ),
+                select_rows(conn, target_code, provider),
+            )
+
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Tulis ke file sementara dulu supaya file lama tetap utuh jika gagal
+        temp_filename = f"{filename}.part"
+        try:
+            wb.save(temp_filename)
+        except BaseException:
+            # File .part setengah jadi tidak boleh tertinggal
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+            raise
+        os.replace(temp_filename, filename)
+        logging.info(f"📁⠀{total} baris diekspor ke {filename}")
+        return total
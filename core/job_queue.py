@@ -0,0 +1,229 @@
+"""
+Modul antrian job berbasis SQLite untuk mode daemon
+"""
+
+import logging
+import os
+import socket
+import sqlite3
+from typing import Dict, List, Optional
+from config import DEFAULT_CONFIG
+from models.data_models import Job
+from .database import DatabaseHandler
+from .utils import get_target_code
+
+JOB_COLUMNS = (
+    "id, url, target_code, provider, status, attempts, worker, enqueued_at, "
+    "started_at, finished_at, seconds, rows, new_rows, error, refresh"
+)
+JOB_STATUSES = ("queued", "running", "done", "failed")
+
+
+def worker_name() -> str:
+    """Nama worker yang dicatat di job: host dan pid proses ini"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobQueue:
+    """
+    Antrian job di tabel jobs (database yang sama dengan scraped_data).
+    Klien menambah URL dengan enqueue, daemon mengambilnya satu per satu
+    dengan claim. Setiap perubahan status memakai BEGIN IMMEDIATE agar
+    satu job tidak diambil dua kali.
+    """
+
+    @staticmethod
+    def _connect() -> sqlite3.Connection:
+        return DatabaseHandler._connect()
+
+    @staticmethod
+    def _to_job(row: tuple) -> Job:
+        job = Job(*row)
+        job.refresh = bool(job.refresh)
+        return job
+
+    @staticmethod
+    def enqueue(
+        urls: List[str], provider: Optional[str] = None, refresh: bool = False
+    ) -> int:
+        """
+        Menambah URL ke antrian dan mengembalikan jumlah job baru. URL yang
+        masih queued/running tidak ditambahkan lagi; dengan refresh, job
+        queued yang sudah ada ikut ditandai refresh.
+        """
+        added = 0
+        conn = JobQueue._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for url in dict.fromkeys(url.strip() for url in urls if url.strip()):
+                exists = conn.execute(
+                    "SELECT 1 FROM jobs WHERE url = ? AND status IN ('queued', 'running')",
+                    (url,),
+                ).fetchone()
+                if exists:
+                    if refresh:
+                        conn.execute(
+                            "UPDATE jobs SET refresh = 1 WHERE url = ? AND status = 'queued'",
+                            (url,),
+                        )
+                    logging.info(f"⏭⠀Job untuk {url} sudah ada di antrian")
+                    continue
+                conn.execute(
+                    """
+                    INSERT INTO jobs (url, target_code, provider, refresh)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (url, get_target_code(url), provider, int(refresh)),
+                )
+                added += 1
+        return added
+
+    @staticmethod
+    def claim(worker: str) -> Optional[Job]:
+        """
+        Mengambil job queued berikutnya dan menandainya running. Job baru
+        didahulukan sebelum job yang sedang dicoba ulang.
+        """
+        conn = JobQueue._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY attempts, id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'running', attempts = attempts + 1, worker = ?,
+                    started_at = CURRENT_TIMESTAMP, finished_at = NULL, error = NULL
+                WHERE id = ?
+                """,
+                (worker, row[0]),
+            )
+            return JobQueue.get_job(row[0])
+
+    @staticmethod
+    def complete(job_id: int, rows: int, new_rows: int, seconds: float):
+        conn = JobQueue._connect()
+        with conn:
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'done', finished_at = CURRENT_TIMESTAMP,
+                    seconds = ?, rows = ?, new_rows = ?, error = NULL
+                WHERE id = ?
+                """,
+                (seconds, rows, new_rows, job_id),
+            )
+
+    @staticmethod
+    def fail(job_id: int, error: str, seconds: float) -> str:
+        """
+        Mencatat job gagal. Job dikembalikan ke antrian selama percobaannya
+        belum mencapai daemon.max_attempts. Mengembalikan status barunya.
+        """
+        max_attempts = DEFAULT_CONFIG.daemon.max_attempts
+        conn = JobQueue._connect()
+        with conn:
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status = CASE WHEN attempts < ? THEN 'queued' ELSE 'failed' END,
+                    finished_at = CURRENT_TIMESTAMP, seconds = ?, error = ?
+                WHERE id = ?
+                """,
+                (max_attempts, seconds, error, job_id),
+            )
+        job = JobQueue.get_job(job_id)
+        return job.status if job else "failed"
+
+    @staticmethod
+    def release(job_id: int):
+        """Mengembalikan job yang belum selesai ke antrian tanpa menghitung percobaan"""
+        conn = JobQueue._connect()
+        with conn:
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'queued', attempts = MAX(attempts - 1, 0), worker = NULL
+                WHERE id = ? AND status = 'running'
+                """,
+                (job_id,),
+            )
+
+    @staticmethod
+    def requeue_running(worker: str) -> int:
+        """
+        Mengembalikan job running milik daemon yang berhenti mendadak ke
+        antrian. Dipanggil saat daemon mulai: hanya job milik worker ini atau
+        yang dimulai lebih lama dari daemon.stale_running_after, sehingga job
+        yang sedang dikerjakan daemon lain di database yang sama tidak diambil.
+        """
+        max_age = DEFAULT_CONFIG.daemon.stale_running_after
+        conn = JobQueue._connect()
+        with conn:
+            cursor = conn.execute(
+                """
+                UPDATE jobs SET status = 'queued', worker = NULL
+                WHERE status = 'running'
+                  AND (worker = ? OR started_at < datetime('now', ?))
+                """,
+                (worker, f"-{float(max_age)} seconds"),
+            )
+        return cursor.rowcount
+
+    @staticmethod
+    def get_job(job_id: int) -> Optional[Job]:
+        row = (
+            JobQueue._connect()
+            .execute(f"SELECT {JOB_COLUMNS} FROM jobs WHERE id = ?", (job_id,))
+            .fetchone()
+        )
+        return JobQueue._to_job(row) if row else None
+
+    @staticmethod
+    def get_jobs(status: Optional[str] = None, limit: int = 0) -> List[Job]:
+        """Job terbaru lebih dulu, opsional difilter per status"""
+        where = "WHERE status = ?" if status else ""
+        params = [status] if status else []
+        query = f"SELECT {JOB_COLUMNS} FROM jobs {where} ORDER BY id DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        cursor = JobQueue._connect().execute(query, params)
+        return [JobQueue._to_job(row) for row in cursor]
+
+    @staticmethod
+    def counts() -> Dict[str, int]:
+        """Jumlah job per status"""
+        cursor = JobQueue._connect().execute(
+            "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+        )
+        counts = dict.fromkeys(JOB_STATUSES, 0)
+        counts.update(cursor)
+        return counts
+
+    @staticmethod
+    def daily_stats(days: int = 7) -> List[tuple]:
+        """
+        Throughput per hari untuk job yang sudah selesai:
+        (tanggal, done, failed, total baris, baris baru, rata-rata detik per job)
+        """
+        cursor = JobQueue._connect().execute(
+            """
+            SELECT DATE(finished_at) AS day,
+                   SUM(status = 'done'),
+                   SUM(status = 'failed'),
+                   COALESCE(SUM(rows), 0),
+                   COALESCE(SUM(new_rows), 0),
+                   AVG(CASE WHEN status = 'done' THEN seconds END)
+            FROM jobs
+            WHERE status IN ('done', 'failed')
+              AND finished_at >= DATE('now', ?)
+            GROUP BY day
+            ORDER BY day DESC
+            """,
+            (f"-{max(1, days) - 1} days",),
+        )
+        return cursor.fetchall()
@@ -17,11 +17,17 @@ class BatchLogger:
     """
 
     def __init__(
-        self, total_items: int, actual_items: int, process_name: str = "PROCESS"
+        self,
+        total_items: int,
+        actual_items: int,
+        process_name: str = "PROCESS",
+        show_progress: bool = True,
     ):
         self.total = total_items
         self.actual_items = actual_items
         self.process_name = process_name
+        # Progress bar rich hanya boleh aktif satu per proses
+        self.show_progress = show_progress
         self.start_time = time.time()
         self.current = 0
         self.progress = Progress(
@@ -38,7 +44,7 @@ class BatchLogger:
         Menampilkan progres real-time menggunakan rich progress bar
         """
         self.current = current
-        if self.total == 0:
+        if self.total == 0 or not self.show_progress:
             return
         if self.task is None:
             self.progress.start()
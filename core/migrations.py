@@ -0,0 +1,205 @@
+"""
+Modul untuk migrasi skema SQLite yang diberi versi lewat PRAGMA user_version
+"""
+
+import logging
+import os
+import sqlite3
+from typing import Callable, List, Tuple
+
+# Database lama milik SQLiteHandler (tabel `files`) yang digabung ke scraped_data
+LEGACY_DB_PATH = os.path.join("results", "filecrypt.db")
+
+SCRAPED_COLUMNS = "title, provider, size, status, download_url, bypass_url, target_code"
+
+
+def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    cursor = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    )
+    return cursor.fetchone() is not None
+
+
+def _create_scraped_data(conn: sqlite3.Connection):
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS scraped_data (
+            title TEXT,
+            provider TEXT,
+            size TEXT,
+            status TEXT,
+            download_url TEXT,
+            bypass_url TEXT,
+            target_code TEXT,
+            PRIMARY KEY (title, provider, target_code)
+        )
+        """
+    )
+
+
+def _add_lookup_indexes(conn: sqlite3.Connection):
+    # Primary key diawali title, jadi pencarian per target_code/provider
+    # sebelumnya selalu full scan. Kedua index ini juga mencakup semua kolom
+    # yang dibutuhkan GROUP BY target_code dan filter provider.
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_scraped_target_provider
+        ON scraped_data (target_code, provider, title)
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_scraped_provider_target
+        ON scraped_data (provider, target_code)
+        """
+    )
+
+
+def _merge_files_table(conn: sqlite3.Connection):
+    """Menggabungkan tabel `files` (skema SQLiteHandler lama) ke scraped_data"""
+    if _table_exists(conn, "files"):
+        cursor = conn.execute(
+            f"""
+            INSERT OR IGNORE INTO scraped_data ({SCRAPED_COLUMNS})
+            SELECT {SCRAPED_COLUMNS} FROM files
+            """
+        )
+        logging.info(f"[SQLITE] {cursor.rowcount} baris dari tabel files digabung")
+        conn.execute("DROP TABLE files")
+
+    main_path = conn.execute("PRAGMA database_list").fetchone()[2]
+    if os.path.exists(LEGACY_DB_PATH) and os.path.abspath(
+        LEGACY_DB_PATH
+    ) != os.path.abspath(main_path or ""):
+        legacy = sqlite3.connect(LEGACY_DB_PATH)
+        try:
+            if _table_exists(legacy, "files"):
+                cursor = conn.executemany(
+                    f"""
+                    INSERT OR IGNORE INTO scraped_data ({SCRAPED_COLUMNS})
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    legacy.execute(f"SELECT {SCRAPED_COLUMNS} FROM files"),
+                )
+                logging.info(
+                    f"[SQLITE] {cursor.rowcount} baris dari {LEGACY_DB_PATH} digabung"
+                )
+        finally:
+            legacy.close()
+
+
+def _create_containers(conn: sqlite3.Connection):
+    """
+    Tabel metadata per container, diisi awal dari scraped_data. Judul container
+    tidak tersimpan di scraped_data (title di sana adalah nama file), jadi
+    dibiarkan NULL sampai container di-scrape ulang.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS containers (
+            target_code TEXT PRIMARY KEY,
+            title TEXT,
+            episode_count INTEGER,
+            providers TEXT,
+            first_scraped_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            last_scraped_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            row_count INTEGER DEFAULT 0
+        )
+        """
+    )
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO containers (target_code, providers, row_count)
+        SELECT target_code, GROUP_CONCAT(DISTINCT provider), COUNT(*)
+        FROM scraped_data
+        WHERE target_code IS NOT NULL
+        GROUP BY target_code
+        """
+    )
+
+
+def _add_container_fingerprint(conn: sqlite3.Connection):
+    conn.execute("ALTER TABLE containers ADD COLUMN fingerprint TEXT")
+
+
+def _add_resolved_at(conn: sqlite3.Connection):
+    # Baris lama tidak diketahui umurnya, jadi resolved_at NULL = kedaluwarsa
+    conn.execute("ALTER TABLE scraped_data ADD COLUMN resolved_at TEXT")
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_scraped_freshness
+        ON scraped_data (target_code, provider, resolved_at)
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_scraped_provider_freshness
+        ON scraped_data (provider, resolved_at, target_code)
+        """
+    )
+    conn.execute("ALTER TABLE containers ADD COLUMN url TEXT")
+
+
+def _create_jobs(conn: sqlite3.Connection):
+    """
+    Antrian job untuk mode daemon; status: queued, running, done, failed.
+    refresh = 1 membuat daemon me-resolve ulang link kedaluwarsa job tersebut.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT NOT NULL,
+            target_code TEXT,
+            provider TEXT,
+            status TEXT NOT NULL DEFAULT 'queued',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            worker TEXT,
+            enqueued_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            started_at TEXT,
+            finished_at TEXT,
+            seconds REAL,
+            rows INTEGER,
+            new_rows INTEGER,
+            error TEXT,
+            refresh INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, id)")
+
+
+# (versi, deskripsi, fungsi). Tambahkan migrasi baru di akhir, jangan ubah
+# migrasi yang sudah dirilis.
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "tabel scraped_data", _create_scraped_data),
+    (2, "index target_code/provider", _add_lookup_indexes),
+    (3, "gabung tabel files", _merge_files_table),
+    (4, "tabel containers", _create_containers),
+    (5, "fingerprint container", _add_container_fingerprint),
+    (6, "resolved_at dan url container", _add_resolved_at),
+    (7, "tabel jobs", _create_jobs),
+]
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Menjalankan migrasi yang belum diterapkan, masing-masing dalam transaksinya
+    sendiri, dan mengembalikan versi skema akhir
+    """
+    for version, description, apply in MIGRATIONS:
+        if get_version(conn) >= version:
+            continue
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # Proses lain mungkin sudah menjalankan migrasi ini lebih dulu
+            if get_version(conn) >= version:
+                continue
+            apply(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+        logging.info(f"[SQLITE] Migrasi {version} diterapkan: {description}")
+    return get_version(conn)
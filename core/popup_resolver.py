@@ -0,0 +1,139 @@
+"""
+Modul untuk menangkap URL tujuan popup download di level jaringan
+"""
+
+import logging
+import weakref
+from typing import Optional
+from urllib.parse import urljoin, urlparse
+from config import DEFAULT_CONFIG
+
+# Satu resolver per konteks browser
+_RESOLVERS: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+# Halaman container milik scraper, navigasinya tidak pernah ditangkap
+_OWNERS: "weakref.WeakSet" = weakref.WeakSet()
+
+
+class PopupResolver:
+    """
+    Route di level konteks yang membaca navigasi popup download.
+
+    Navigasi ke host FileCrypt (halaman Link) tetap diteruskan, kecuali jika
+    responsnya redirect HTTP ke host lain. Navigasi pertama ke host provider
+    dicatat URL-nya lalu dibatalkan, sehingga halaman provider tidak pernah
+    dirender. Halaman milik scraper (owner) tidak pernah disentuh.
+    """
+
+    def __init__(self):
+        self.internal_hosts = {
+            urlparse(url).hostname for url in DEFAULT_CONFIG.scraper.valid_urls
+        }
+        self.resolved: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def for_context(cls, context) -> "PopupResolver":
+        """Mengambil resolver untuk konteks sync, memasang route jika belum ada"""
+        resolver = _RESOLVERS.get(context)
+        if resolver is None:
+            resolver = cls()
+            context.route("**/*", resolver.handle_route)
+            _RESOLVERS[context] = resolver
+        return resolver
+
+    @classmethod
+    async def for_context_async(cls, context) -> "PopupResolver":
+        """Varian asyncio dari for_context"""
+        resolver = _RESOLVERS.get(context)
+        if resolver is None:
+            resolver = cls()
+            await context.route("**/*", resolver.handle_route_async)
+            _RESOLVERS[context] = resolver
+        return resolver
+
+    @staticmethod
+    def register_owner(page):
+        """Menandai halaman container milik scraper agar navigasinya tidak ditangkap"""
+        _OWNERS.add(page)
+
+    def is_internal(self, url: str) -> bool:
+        return urlparse(url).hostname in self.internal_hosts
+
+    def pop(self, page) -> Optional[str]:
+        """Mengambil dan menghapus URL hasil tangkapan untuk popup"""
+        return self.resolved.pop(page, None)
+
+    def has(self, page) -> bool:
+        return page in self.resolved
+
+    def _capture_target(self, request):
+        """Mengembalikan halaman popup jika request adalah navigasi yang perlu ditangkap"""
+        try:
+            if not request.is_navigation_request():
+                return None
+            frame = request.frame
+            if frame.parent_frame is not None:
+                return None
+            page = frame.page
+        except Exception:
+            return None
+        if page in _OWNERS or not request.url.startswith("http"):
+            return None
+        return page
+
+    def _redirect_target(self, url: str, response) -> Optional[str]:
+        """URL tujuan redirect HTTP dari halaman FileCrypt ke host provider"""
+        location = response.headers.get("location")
+        if not (300 <= response.status < 400 and location):
+            return None
+        target = urljoin(url, location)
+        return None if self.is_internal(target) else target
+
+    def _resolve(self, page, url: str):
+        logging.debug(f"[RESOLVER] URL popup ditangkap: {url}")
+        self.resolved[page] = url
+
+    def handle_route(self, route, request):
+        page = self._capture_target(request)
+        if page is None:
+            route.fallback()
+            return
+        url = request.url
+        if not self.is_internal(url):
+            self._resolve(page, url)
+            route.abort()
+            return
+        try:
+            response = route.fetch(max_redirects=0)
+        except Exception as e:
+            logging.debug(f"[RESOLVER] Gagal mengambil {url}: {str(e)}")
+            route.fallback()
+            return
+        target = self._redirect_target(url, response)
+        if target:
+            self._resolve(page, target)
+            route.abort()
+        else:
+            route.fulfill(response=response)
+
+    async def handle_route_async(self, route, request):
+        page = self._capture_target(request)
+        if page is None:
+            await route.fallback()
+            return
+        url = request.url
+        if not self.is_internal(url):
+            self._resolve(page, url)
+            await route.abort()
+            return
+        try:
+            response = await route.fetch(max_redirects=0)
+        except Exception as e:
+            logging.debug(f"[RESOLVER] Gagal mengambil {url}: {str(e)}")
+            await route.fallback()
+            return
+        target = self._redirect_target(url, response)
+        if target:
+            self._resolve(page, target)
+            await route.abort()
+        else:
+            await route.fulfill(response=response)
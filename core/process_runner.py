@@ -0,0 +1,209 @@
+"""
+Modul untuk membagi daftar URL ke beberapa proses browser dengan profil kloningan
+"""
+
+import logging
+import multiprocessing
+import os
+import queue as queue_module
+import shutil
+from typing import Callable, List, Optional
+from config import DEFAULT_CONFIG
+from models.data_models import ContainerResult
+from .browser import BrowserSession
+from .logger import setup_logging
+from .runner import MultiTabRunner
+from .utils import get_target_code
+
+# File kunci Chromium (SingletonLock/Socket/Cookie) menandai profil sedang
+# dipakai; cache tidak perlu ikut disalin dan hanya memperlambat kloning
+PROFILE_IGNORE = shutil.ignore_patterns(
+    "Singleton*",
+    "lockfile",
+    "Cache",
+    "Code Cache",
+    "GPUCache",
+    "ShaderCache",
+    "GrShaderCache",
+)
+
+
+def clone_profile(source: str, destination: str) -> str:
+    """Menyalin ulang profil browser ke destination dan mengembalikan path-nya"""
+    if os.path.exists(destination):
+        shutil.rmtree(destination, ignore_errors=True)
+    if not os.path.isdir(source):
+        os.makedirs(destination, exist_ok=True)
+        return destination
+    try:
+        shutil.copytree(source, destination, ignore=PROFILE_IGNORE)
+    except shutil.Error as e:
+        # File yang sedang dikunci browser lain dilewati, sisanya tetap dipakai
+        logging.warning(
+            f"[WARNING] {len(e.args[0])} file profil gagal disalin ke {destination}"
+        )
+    return destination
+
+
+def shard_profile_dir(index: int) -> str:
+    base = os.path.abspath(DEFAULT_CONFIG.browser.user_data_dir).rstrip("\\/")
+    return f"{base}_shard{index}"
+
+
+def _error_result(url: str, error: str) -> ContainerResult:
+    target_code = get_target_code(url)
+    return ContainerResult(
+        url=url, target_code=target_code, container_title=target_code, error=error
+    )
+
+
+def _shard_worker(
+    index: int,
+    urls: List[str],
+    profile_dir: str,
+    selected_provider: Optional[str],
+    refresh: Optional[bool],
+    config,
+    results_queue,
+):
+    """
+    Dijalankan di proses anak (spawn): memakai konfigurasi proses induk
+    (termasuk opsi CLI) dengan profil kloningannya sendiri, lalu mengirim
+    setiap hasil ke proses induk lewat antrian
+    """
+    for name in type(config).model_fields:
+        setattr(DEFAULT_CONFIG, name, getattr(config, name))
+    DEFAULT_CONFIG.browser.user_data_dir = profile_dir
+    setup_logging()
+    logging.info(f"⚙⠀ [SHARD {index}] {len(urls)} URL dengan profil {profile_dir}")
+
+    reported = set()
+
+    def forward(result: ContainerResult):
+        # Handle elemen Playwright tidak bisa dikirim antar proses
+        for item in result.data:
+            item.download_button = None
+            item.row_element = None
+        reported.add(result.url)
+        results_queue.put((index, result))
+
+    try:
+        with BrowserSession() as session:
+            MultiTabRunner(
+                session,
+                selected_provider=selected_provider,
+                on_result=forward,
+                refresh=refresh,
+            ).run(urls)
+    except Exception as e:
+        logging.error(f"❌⠀ [SHARD {index}] Worker berhenti: {str(e)}")
+        for url in urls:
+            if url not in reported:
+                forward(_error_result(url, f"Shard {index} gagal: {str(e)}"))
+    finally:
+        results_queue.put((index, None))
+
+
+class ProcessRunner:
+    """
+    Membagi daftar URL ke beberapa proses, masing-masing dengan Chromium dan
+    salinan user_data_dir sendiri, sehingga renderer tidak lagi dibatasi satu
+    proses browser. Hasil dikirim ke proses induk dan diteruskan ke on_result,
+    jadi penulisan ke database tetap lewat DatabaseHandler di satu tempat.
+    """
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        selected_provider: Optional[str] = None,
+        on_result: Optional[Callable[[ContainerResult], None]] = None,
+        refresh: Optional[bool] = None,
+    ):
+        self.processes = max(1, processes or DEFAULT_CONFIG.scraper.processes)
+        self.selected_provider = selected_provider
+        self.on_result = on_result
+        self.refresh = refresh
+
+    def _shards(self, urls: List[str]) -> List[List[str]]:
+        count = min(self.processes, len(urls))
+        return [urls[i::count] for i in range(count)]
+
+    def run(self, urls: List[str]) -> List[ContainerResult]:
+        """Memproses semua URL dan mengembalikan hasil sesuai urutan selesai"""
+        if not urls:
+            return []
+        shards = self._shards(urls)
+        source = os.path.abspath(DEFAULT_CONFIG.browser.user_data_dir)
+        logging.info(
+            f"⚙⠀ Memproses {len(urls)} URL dengan {len(shards)} proses browser"
+        )
+
+        # spawn: Playwright sync tidak aman di proses hasil fork, dan sama
+        # dengan perilaku bawaan di Windows
+        context = multiprocessing.get_context("spawn")
+        results_queue = context.Queue()
+        workers = {}
+        for index, shard in enumerate(shards):
+            profile_dir = clone_profile(source, shard_profile_dir(index))
+            worker = context.Process(
+                target=_shard_worker,
+                args=(
+                    index,
+                    shard,
+                    profile_dir,
+                    self.selected_provider,
+                    self.refresh,
+                    DEFAULT_CONFIG,
+                    results_queue,
+                ),
+                name=f"shard-{index}",
+            )
+            worker.start()
+            workers[index] = worker
+
+        results: List[ContainerResult] = []
+        reported = set()
+
+        def record(result: ContainerResult):
+            reported.add(result.url)
+            results.append(result)
+            if self.on_result:
+                self.on_result(result)
+
+        running = set(workers)
+        try:
+            while running:
+                try:
+                    index, result = results_queue.get(timeout=5)
+                except queue_module.Empty:
+                    for index in list(running):
+                        if workers[index].is_alive():
+                            continue
+                        # Proses mati tanpa sempat mengirim tanda selesai
+                        exitcode = workers[index].exitcode
+                        logging.error(
+                            f"❌⠀ [SHARD {index}] Proses berhenti (exit code {exitcode})"
+                        )
+                        running.discard(index)
+                        for url in shards[index]:
+                            if url not in reported:
+                                record(
+                                    _error_result(
+                                        url,
+                                        f"Proses shard {index} berhenti ({exitcode})",
+                                    )
+                                )
+                    continue
+                if result is None:
+                    running.discard(index)
+                else:
+                    record(result)
+        except KeyboardInterrupt:
+            logging.info("⚙⠀ Menghentikan semua proses shard...")
+            for worker in workers.values():
+                worker.terminate()
+            raise
+        finally:
+            for worker in workers.values():
+                worker.join(timeout=10)
+        return results
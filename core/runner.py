@@ -0,0 +1,317 @@
+"""
+Modul untuk memproses daftar URL secara bersamaan di beberapa tab browser
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple
+from config import DEFAULT_CONFIG
+from models.data_models import ContainerResult
+from .browser import BrowserSession, StorageState
+from .scraper import FileCryptScraper
+from .utils import get_target_code
+
+
+def scrape_container(
+    scraper: FileCryptScraper, url: str, selected_provider: Optional[str] = None
+) -> ContainerResult:
+    """
+    Menjalankan alur scraping untuk halaman container yang sudah dimuat:
+    password, CAPTCHA, info container, lalu data file
+    """
+    target_code = get_target_code(url)
+    scraper.wait_until_ready()
+    if not scraper.handle_password():
+        raise RuntimeError("Gagal menangani password")
+    if not scraper.handle_captcha():
+        raise RuntimeError("Gagal menangani CAPTCHA")
+
+    title, total_episodes = scraper.get_additional_info()
+    container_title = (
+        title
+        if title and title.strip().lower() not in ("n/a", "unknown", "")
+        else target_code
+    )
+    logging.info(f"⚙⠀ [{target_code}] {container_title} ({total_episodes})")
+
+    if scraper.is_unchanged():
+        return ContainerResult(
+            url=url,
+            target_code=target_code,
+            container_title=container_title,
+            episode_count=scraper.episode_count,
+            unchanged=True,
+        )
+
+    data = scraper.scrape_file_info(selected_provider=selected_provider)
+    return ContainerResult(
+        url=url,
+        target_code=target_code,
+        container_title=container_title,
+        data=data,
+        episode_count=scraper.episode_count,
+        fingerprint=scraper.completed_fingerprint(data, selected_provider),
+    )
+
+
+class MultiTabRunner:
+    """
+    Memproses daftar URL dengan beberapa tab di konteks browser yang sama.
+
+    Playwright sync berjalan di satu thread, jadi satu tab diproses pada satu
+    waktu, sementara tab lain sudah memuat URL berikutnya di browser. Setiap
+    tab memakai FileCryptScraper sendiri dan mengambil URL dari antrian bersama.
+
+    Dengan scraper.park_interactive, container yang meminta password/CAPTCHA
+    diparkir: tab-nya dibiarkan terbuka untuk diselesaikan manusia, runner
+    lanjut ke URL lain, dan container dilanjutkan begitu prompt hilang.
+    """
+
+    def __init__(
+        self,
+        session: BrowserSession,
+        tabs: Optional[int] = None,
+        selected_provider: Optional[str] = None,
+        on_result: Optional[Callable[[ContainerResult], None]] = None,
+        refresh: Optional[bool] = None,
+    ):
+        self.session = session
+        self.tabs = max(1, tabs or DEFAULT_CONFIG.scraper.concurrent_tabs)
+        self.selected_provider = selected_provider
+        self.on_result = on_result
+        self.refresh = refresh
+        self.timeouts = DEFAULT_CONFIG.timeouts
+        self.park = DEFAULT_CONFIG.scraper.park_interactive
+        # (scraper, url, alasan, waktu parkir) untuk container yang menunggu manusia
+        self.parked: List[Tuple[FileCryptScraper, str, str, float]] = []
+
+    def _start_navigation(self, scraper: FileCryptScraper, url: str) -> bool:
+        """Mulai memuat URL tanpa menunggu halaman selesai dimuat"""
+        try:
+            scraper.page.goto(url, wait_until="commit", timeout=15000)
+            return True
+        except Exception as e:
+            logging.debug(f"[RUNNER] Navigasi awal gagal untuk {url}: {str(e)}")
+            return False
+
+    def _finish_navigation(self, scraper: FileCryptScraper, url: str, started: bool):
+        """Menunggu halaman selesai dimuat, mengulang navigasi jika gagal"""
+        if started:
+            try:
+                scraper.page.wait_for_load_state(
+                    "load", timeout=self.timeouts.page_load
+                )
+                return
+            except Exception as e:
+                logging.debug(f"[RUNNER] Halaman belum siap untuk {url}: {str(e)}")
+
+        for attempt in range(3):
+            try:
+                scraper.page.goto(url, wait_until="load", timeout=15000)
+                return
+            except Exception as e:
+                logging.warning(
+                    f"[WARNING] Gagal memuat URL, mencoba lagi ({attempt + 1}/3): {str(e)}"
+                )
+        raise RuntimeError("Gagal memuat URL setelah 3 percobaan")
+
+    @staticmethod
+    def _error_result(url: str, error: str) -> ContainerResult:
+        target_code = get_target_code(url)
+        return ContainerResult(
+            url=url, target_code=target_code, container_title=target_code, error=error
+        )
+
+    @staticmethod
+    def _pending_interaction(scraper: FileCryptScraper) -> Optional[str]:
+        """Alasan ("password"/"captcha") jika halaman masih menunggu manusia"""
+        if scraper.detect_password():
+            return "password"
+        if scraper.detect_captcha():
+            return "captcha"
+        return None
+
+    def _process(
+        self, scraper: FileCryptScraper, url: str, started: bool
+    ) -> Optional[ContainerResult]:
+        """Memproses satu URL; None jika container diparkir"""
+        try:
+            self._finish_navigation(scraper, url, started)
+            if self.park:
+                scraper.wait_until_ready()
+                reason = self._pending_interaction(scraper)
+                if reason:
+                    self._park(scraper, url, reason)
+                    return None
+            return scrape_container(scraper, url, self.selected_provider)
+        except Exception as e:
+            logging.error(f"❌⠀ Gagal memproses URL {url}: {str(e)}")
+            return self._error_result(url, str(e))
+
+    def _park(self, scraper: FileCryptScraper, url: str, reason: str):
+        self.parked.append((scraper, url, reason, time.monotonic()))
+        logging.warning(
+            f"🔐⠀[{get_target_code(url)}] Butuh {reason}, diparkir sampai "
+            f"diselesaikan di tab-nya ({len(self.parked)} menunggu)"
+        )
+        try:
+            scraper.page.bring_to_front()
+        except Exception as e:
+            logging.debug(f"[RUNNER] Gagal menampilkan tab {url}: {str(e)}")
+
+    def _resume_parked(self) -> List[ContainerResult]:
+        """
+        Memeriksa container yang diparkir: yang sudah diselesaikan dan
+        halamannya siap dilanjutkan, yang meminta prompt baru diparkir lagi,
+        yang melewati batas waktu dianggap gagal
+        """
+        finished = []
+        still_parked = []
+        for scraper, url, reason, parked_at in self.parked:
+            target_code = get_target_code(url)
+            closed = scraper.page.is_closed()
+            current = None if closed else self._pending_interaction(scraper)
+            if not closed and current is None:
+                # detect_* juga False ketika halaman sedang bernavigasi (mis.
+                # setelah submit password): tunggu halaman siap lalu cek ulang
+                ready = scraper.wait_until_ready()
+                closed = scraper.page.is_closed()
+                if not closed:
+                    current = self._pending_interaction(scraper)
+                    if current is None and not ready:
+                        current = reason
+            if closed:
+                result = self._error_result(
+                    url, f"Tab ditutup sebelum {reason} diselesaikan"
+                )
+            elif current is None:
+                logging.info(f"🔓⠀[{target_code}] {reason} selesai, dilanjutkan")
+                StorageState.save(scraper.page.context)
+                try:
+                    result = scrape_container(scraper, url, self.selected_provider)
+                except Exception as e:
+                    logging.error(f"❌⠀ Gagal memproses URL {url}: {str(e)}")
+                    result = self._error_result(url, str(e))
+            else:
+                if current != reason:
+                    # Setelah password, halaman bisa lanjut meminta CAPTCHA:
+                    # diparkir lagi dengan batas waktu baru
+                    logging.warning(
+                        f"🔐⠀[{target_code}] {reason} selesai, butuh {current}, "
+                        "diparkir lagi"
+                    )
+                    reason, parked_at = current, time.monotonic()
+                timeout = getattr(self.timeouts, reason)
+                if time.monotonic() - parked_at < timeout:
+                    still_parked.append((scraper, url, reason, parked_at))
+                    continue
+                logging.error(
+                    f"[ERROR] [{target_code}] Timeout {reason} setelah {timeout} detik"
+                )
+                result = self._error_result(url, f"Timeout menunggu {reason}")
+            result.needs_attention = reason
+            self.session.release_page(scraper.page)
+            finished.append(result)
+        self.parked = still_parked
+        return finished
+
+    def _wait_for_humans(self, announced: set) -> set:
+        """Menunggu sebentar ketika hanya tersisa container yang diparkir"""
+        waiting = {get_target_code(url) for _, url, _, _ in self.parked}
+        if waiting != announced:
+            logging.info(
+                "⏳⠀Menunggu password/CAPTCHA diselesaikan untuk: "
+                + ", ".join(
+                    f"{get_target_code(url)} ({reason})"
+                    for _, url, reason, _ in self.parked
+                )
+            )
+        try:
+            # wait_for_timeout tetap memproses event Playwright selama menunggu
+            self.parked[0][0].page.wait_for_timeout(1000)
+        except Exception:
+            time.sleep(1)
+        return waiting
+
+    def _record(self, result: ContainerResult, results: List[ContainerResult]):
+        self.session.mark_container_done()
+        results.append(result)
+        if self.on_result:
+            self.on_result(result)
+
+    def run(self, urls: List[str]) -> List[ContainerResult]:
+        """Memproses semua URL dan mengembalikan hasil sesuai urutan selesai"""
+        pending: Deque[str] = deque(urls)
+        active: Deque[Tuple[FileCryptScraper, str, bool]] = deque()
+        idle: List[FileCryptScraper] = []
+        results: List[ContainerResult] = []
+        announced: set = set()
+        logging.info(
+            f"⚙⠀ Memproses {len(urls)} URL dengan {self.tabs} tab "
+            "(satu tab diproses pada satu waktu)"
+        )
+
+        while pending or active or self.parked:
+            if self.parked and self.session.crashed:
+                # Tab yang diparkir ikut mati, URL-nya diproses ulang setelah restart
+                pending.extend(url for _, url, _, _ in self.parked)
+                self.parked.clear()
+            for result in self._resume_parked():
+                self._record(result, results)
+
+            if (
+                pending
+                and not active
+                and not self.parked
+                and self.session.needs_restart
+            ):
+                # Semua tab sudah kosong, aman untuk membuka ulang browser
+                idle.clear()
+                self.session.restart()
+
+            # Selama ada tab diparkir browser tidak boleh di-restart, jadi URL
+            # lain tetap dibuka di konteks yang sama sampai parkiran kosong
+            defer_restart = bool(self.parked) and self.session.can_defer_restart()
+            while (
+                pending
+                and len(active) < self.tabs
+                and (defer_restart or not self.session.needs_restart)
+            ):
+                scraper = (
+                    idle.pop()
+                    if idle
+                    else FileCryptScraper(
+                        self.session.new_page(defer_restart), self.refresh
+                    )
+                )
+                url = pending.popleft()
+                started = self._start_navigation(scraper, url)
+                active.append((scraper, url, started))
+
+            if not active:
+                if self.parked:
+                    announced = self._wait_for_humans(announced)
+                continue
+
+            scraper, url, started = active.popleft()
+            result = self._process(scraper, url, started)
+            if result is None:
+                # Tab tetap terbuka untuk manusia, URL berikutnya memakai tab baru
+                continue
+            self._record(result, results)
+
+            if self.session.crashed:
+                # Tab lain ikut mati bersama browser, kembalikan URL-nya ke antrian
+                logging.warning(
+                    f"[WARNING] Browser crash, {len(active)} URL dikembalikan ke antrian"
+                )
+                pending.extendleft(queued for _, queued, _ in reversed(active))
+                active.clear()
+                idle.clear()
+            else:
+                idle.append(scraper)
+
+        for scraper in idle:
+            self.session.release_page(scraper.page)
+        return results
@@ -2,19 +2,52 @@
 Modul utama untuk scraping data dari FileCrypt
 """
 
-import time
+import hashlib
 import logging
+import random
 import re
-from typing import List, Optional
+import time
+from typing import Callable, Dict, List, Optional
 from playwright.sync_api import Page
 from models.data_models import ScrapedData
 from core.database import DatabaseHandler
 from config import DEFAULT_CONFIG
+from .batching import AdaptiveBatchSizer
+from .browser import StorageState
 from .logger import BatchLogger
+from .popup_resolver import PopupResolver
+from .utils import get_target_code, make_item_key, normalize_provider
+
+
+PASSWORD_SELECTOR = "h2:has-text('Password required')"
+CAPTCHA_SELECTOR = "h2:has-text('Security prompt')"
+# Halaman container siap jika daftar file atau salah satu prompt sudah tampil
+READY_SELECTOR = f"tr.kwj3, {PASSWORD_SELECTOR}, {CAPTCHA_SELECTOR}"
+
+# Mengambil judul, provider, ukuran, status, dan keberadaan tombol download
+# untuk semua baris tr.kwj3 dalam satu panggilan page.evaluate
+ROW_EXTRACT_JS = """
+() => Array.from(document.querySelectorAll("tr.kwj3")).map((row, index) => {
+    const titleCell = row.querySelector("td[title]");
+    const providerLink = row.querySelector("td[title] a.external_link");
+    const sizeCell = row.querySelector("td:nth-of-type(3)");
+    const statusIcon = row.querySelector("td.status i");
+    return {
+        index: index,
+        title: titleCell ? titleCell.getAttribute("title") : "N/A",
+        provider: providerLink ? providerLink.textContent : null,
+        size: sizeCell ? sizeCell.textContent.trim() : "N/A",
+        status: statusIcon
+            ? (statusIcon.getAttribute("class") || "").split(/\\s+/).filter(Boolean).join(" ")
+            : "offline",
+        has_button: row.querySelector("td button.download") !== null,
+    };
+})
+"""
 
 
 class FileCryptScraper:
-    def __init__(self, page: Page):
+    def __init__(self, page: Page, refresh: Optional[bool] = None):
         self.page = page
         self.timeouts = DEFAULT_CONFIG.timeouts
         self.providers = DEFAULT_CONFIG.providers
@@ -23,10 +56,308 @@ class FileCryptScraper:
         self.scraper_config = DEFAULT_CONFIG.scraper
         self.database_handler = DatabaseHandler()
         self.container_title = "N/A"
+        self.episode_count: Optional[int] = None
+        self.fingerprint: Optional[str] = None
+        # Resolve ulang baris kedaluwarsa; None = freshness.refresh_on_scrape
+        self.refresh = (
+            DEFAULT_CONFIG.freshness.refresh_on_scrape if refresh is None else refresh
+        )
+        self.pixeldrain_bypass_index = 0
+        self.show_progress = True
+        self.popup_resolver: Optional[PopupResolver] = None
+        self.batch_sizers: Dict[str, AdaptiveBatchSizer] = {}
+        PopupResolver.register_owner(page)
+
+    def _get_target_code(self) -> str:
+        return get_target_code(self.page.url) if self.page.url else "unknown"
+
+    def _normalize_provider(self, provider_text: Optional[str]) -> str:
+        """Menyeragamkan nama provider, semua alias send.* menjadi Send"""
+        return normalize_provider(provider_text)
+
+    def _fingerprint(self, rows: List[dict]) -> str:
+        """Hash urutan-bebas dari judul, provider, dan ukuran semua baris"""
+        lines = sorted(
+            f"{row['title']}\t{self._normalize_provider(row['provider'])}\t{row['size']}"
+            for row in rows
+        )
+        return hashlib.sha1("\n".join(lines).encode("utf-8")).hexdigest()
+
+    def _matches_stored_fingerprint(self, rows: List[dict]) -> bool:
+        self.fingerprint = self._fingerprint(rows)
+        if not self.scraper_config.skip_unchanged:
+            return False
+        target_code = self._get_target_code()
+        container = self.database_handler.get_container(target_code)
+        if not container or container.fingerprint != self.fingerprint:
+            return False
+        # Container tetap diproses jika ada link yang harus di-resolve ulang
+        return not (self.refresh and self.database_handler.get_stale_keys(target_code))
+
+    def completed_fingerprint(
+        self, data: List[ScrapedData], selected_provider: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Fingerprint yang boleh disimpan: hanya jika semua provider di-scrape dan
+        tidak ada item ERROR, supaya container yang belum lengkap tidak dilewati
+        """
+        if selected_provider or not data:
+            return None
+        if any(item.download_url == "ERROR" for item in data):
+            return None
+        return self.fingerprint
+
+    def _apply_download_url(self, item: ScrapedData, download_url: str):
+        """Mengisi download_url dan bypass_url (round-robin untuk pixeldrain)"""
+        item.download_url = download_url
+        item.resolved = True
+        if "pixeldrain.com" in download_url.lower():
+            code = download_url.split("/")[-1]
+            # Gunakan URL bypass secara bergilir
+            selected_bypass = self.pixeldrain.bypass_urls[
+                self.pixeldrain_bypass_index % len(self.pixeldrain.bypass_urls)
+            ]
+            item.bypass_url = selected_bypass.replace("CODE-FILE", code)
+            self.pixeldrain_bypass_index += 1
+
+        # Bersihkan atribut sementara segera setelah selesai digunakan
+        item.download_button = None
+        item.row_element = None
+
+    def _row_button(self, index: int):
+        """Locator tombol download untuk baris ke-index, baru di-resolve saat diklik"""
+        # .first: baris dengan lebih dari satu tombol memicu strict mode Playwright
+        return (
+            self.page.locator("tr.kwj3").nth(index).locator("td button.download").first
+        )
+
+    def _build_row_items(
+        self,
+        rows: List[dict],
+        target_code: str,
+        selected_provider: Optional[str] = None,
+    ) -> tuple[List[ScrapedData], List[ScrapedData], int]:
+        """
+        Mengubah hasil ROW_EXTRACT_JS menjadi ScrapedData.
+        Mengembalikan (all_items, items_to_scrape, skipped_items)
+        """
+        all_items = []
+        items_to_scrape = []
+        skipped_items = 0
+        known_records = self.database_handler.get_known_records(target_code)
+        stale_keys = (
+            self.database_handler.get_stale_keys(target_code) if self.refresh else set()
+        )
+        if stale_keys:
+            logging.info(
+                f"🔄⠀[{target_code}] {len(stale_keys)} link kedaluwarsa akan di-resolve ulang"
+            )
+        # Baris yang tersimpan sebagai ERROR selalu diambil ulang, seperti baris kedaluwarsa
+        error_keys = {
+            key for key, item in known_records.items() if item.download_url == "ERROR"
+        }
+        if error_keys:
+            logging.info(
+                f"🔁⠀[{target_code}] {len(error_keys)} item ERROR dari run sebelumnya diambil ulang"
+            )
+        refetch_keys = stale_keys | error_keys
+        for row in rows:
+            provider = self._normalize_provider(row["provider"])
+            if selected_provider and provider.lower() != selected_provider.lower():
+                continue
+
+            title = row["title"]
+            key = make_item_key(title, provider, target_code)
+            existing_item = known_records.get(key)
+            if existing_item:
+                existing_item.container_title = self.container_title
+                all_items.append(existing_item)
+                if key not in refetch_keys:
+                    skipped_items += 1
+                    continue
+
+            item = ScrapedData(
+                title=title,
+                provider=provider,
+                size=row["size"],
+                status=row["status"],
+                download_url="N/A",
+                bypass_url="N/A",
+                target_code=target_code,
+                container_title=self.container_title,
+                download_button=(
+                    self._row_button(row["index"]) if row["has_button"] else None
+                ),
+            )
+            # Baris kedaluwarsa/ERROR: data lama tetap dipakai jika resolve ulang gagal
+            if not existing_item:
+                all_items.append(item)
+            items_to_scrape.append(item)
+
+        return all_items, items_to_scrape, skipped_items
+
+    def _get_popup_resolver(self) -> Optional[PopupResolver]:
+        if self.scraper_config.popup_resolution != "network":
+            return None
+        return PopupResolver.for_context(self.page.context)
+
+    def _wait_popup_url(self, popup) -> str:
+        """
+        Menunggu URL tujuan popup. Dalam mode "network" URL diambil dari
+        PopupResolver tanpa menunggu halaman provider dirender.
+        """
+        resolver = self.popup_resolver
+        if resolver is None:
+            popup.wait_for_load_state(
+                "domcontentloaded", timeout=self.timeouts.page_load
+            )
+            return popup.url
+
+        if not resolver.has(popup):
+            try:
+                # Navigasi yang ditangkap resolver selalu dibatalkan (requestfailed)
+                popup.wait_for_event(
+                    "requestfailed",
+                    predicate=lambda request: resolver.has(popup),
+                    timeout=self.timeouts.page_load,
+                )
+            except Exception:
+                # Popup lolos dari route, pakai URL halamannya jika sudah di provider
+                if popup.url.startswith("http") and not resolver.is_internal(
+                    popup.url
+                ):
+                    return popup.url
+                raise
+        return resolver.pop(popup)
+
+    def _group_by_provider(
+        self, items: List[ScrapedData]
+    ) -> Dict[str, List[ScrapedData]]:
+        """Mengelompokkan item per provider dengan urutan halaman tetap terjaga"""
+        items_by_provider: Dict[str, List[ScrapedData]] = {}
+        for item in items:
+            items_by_provider.setdefault(item.provider, []).append(item)
+        return items_by_provider
+
+    def _get_batch_sizer(self, provider: str) -> AdaptiveBatchSizer:
+        """Ukuran batch dipelajari per provider dan dibawa ke container berikutnya"""
+        if provider not in self.batch_sizers:
+            self.batch_sizers[provider] = AdaptiveBatchSizer(provider)
+        return self.batch_sizers[provider]
+
+    def _log_batch_summary(self, items_by_provider: Dict[str, List[ScrapedData]]):
+        for provider in items_by_provider:
+            logging.info(f"📦⠀{self.batch_sizers[provider].summary()}")
+
+    def _failed_items(self, items: List[ScrapedData]) -> List[ScrapedData]:
+        """Item gagal yang masih punya sisa percobaan, disiapkan untuk dicoba ulang"""
+        failed = [
+            item
+            for item in items
+            if item.download_url == "ERROR"
+            and item.download_button
+            and item.attempts < self.scraper_config.retry_attempts
+        ]
+        for item in failed:
+            item.download_url = "N/A"
+            item.bypass_url = "N/A"
+        return failed
+
+    def _retry_delay(self, retry_round: int) -> float:
+        """Jeda eksponensial dengan jitter sebelum putaran antrian ulang"""
+        base = self.scraper_config.retry_backoff * (2 ** (retry_round - 1))
+        return base * random.uniform(0.5, 1.5)
+
+    def _log_retry_report(self, items: List[ScrapedData]):
+        retried = [item for item in items if item.attempts > 1]
+        for item in retried:
+            status = "gagal" if item.download_url == "ERROR" else "berhasil"
+            logging.info(
+                f"🔁⠀{item.title} [{item.provider}]: {status} setelah {item.attempts} percobaan"
+            )
+        lost = sum(1 for item in items if item.download_url == "ERROR")
+        if lost:
+            logging.warning(
+                f"[WARNING] {lost} item tetap gagal, disimpan sebagai ERROR dan diambil ulang pada run berikutnya"
+            )
+
+    def _retry_failed_items(self, items: List[ScrapedData]):
+        """Fase 3: memproses ulang item ERROR setelah semua batch utama selesai"""
+        retry_round = 0
+        failed = self._failed_items(items)
+        while failed:
+            retry_round += 1
+            delay = self._retry_delay(retry_round)
+            logging.info(
+                f"🔁⠀Antrian ulang putaran {retry_round}: {len(failed)} item, jeda {delay:.1f}s"
+            )
+            self.page.wait_for_timeout(delay * 1000)
+            batch_size = max(1, self.scraper_config.min_batch_size)
+            for batch_start in range(0, len(failed), batch_size):
+                self._run_popup_batch(failed[batch_start : batch_start + batch_size])
+            failed = self._failed_items(items)
+        self._log_retry_report(items)
+
+    def _merge_results(
+        self, all_items: List[ScrapedData], items_to_scrape: List[ScrapedData]
+    ) -> List[ScrapedData]:
+        """Menggabungkan item yang sudah ada di database dengan hasil scraping baru"""
+        scraped_by_key: Dict[tuple, ScrapedData] = {}
+        for item in items_to_scrape:
+            if item.download_url != "ERROR":
+                scraped_by_key.setdefault(
+                    make_item_key(item.title, item.provider, item.target_code), item
+                )
+
+        final_data = []
+        for item in all_items:
+            merged = scraped_by_key.get(
+                make_item_key(item.title, item.provider, item.target_code), item
+            )
+            merged.container_title = self.container_title
+            final_data.append(merged)
+        return final_data
+
+    def wait_until_ready(self) -> bool:
+        """
+        Menunggu sampai halaman menampilkan daftar file atau prompt
+        password/CAPTCHA, sebagai pengganti jeda tetap setelah goto
+        """
+        try:
+            self.page.wait_for_selector(
+                READY_SELECTOR, timeout=self.timeouts.selector_wait
+            )
+            return True
+        except Exception as e:
+            logging.debug(f"[MAIN] Halaman belum siap: {str(e)}")
+            return False
+
+    def _wait_prompt_gone(
+        self, selector: str, detect: Callable[[], bool], name: str, timeout: float
+    ) -> bool:
+        """
+        Menunggu prompt hilang sampai batas waktu. Password salah atau CAPTCHA
+        gagal memuat ulang halaman dengan prompt yang sama (elemen lama ikut
+        detached), jadi prompt dicek ulang setelah halaman siap.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                self.page.wait_for_selector(
+                    selector, state="detached", timeout=remaining * 1000
+                )
+            except Exception:
+                return False
+            if self.wait_until_ready() and not detect():
+                return True
+            logging.info(f"🔐⠀{name} belum selesai, menunggu lagi...")
 
     def detect_password(self) -> bool:
         try:
-            return bool(self.page.query_selector("h2:has-text('Password required')"))
+            return bool(self.page.query_selector(PASSWORD_SELECTOR))
         except Exception as e:
             logging.error(f"[ERROR] Error deteksi password: {str(e)}")
             return False
@@ -36,19 +367,19 @@ class FileCryptScraper:
             logging.info("🔓⠀URL tidak membutuhkan password")
             return True
         logging.info("🔐⠀Menunggu input password...")
-        start_time = time.time()
         timeout = self.timeouts.password
-        while self.detect_password():
-            if time.time() - start_time > timeout:
-                logging.error(f"[ERROR] Timeout password setelah {timeout} detik")
-                return False
-            time.sleep(self.timeouts.password_check)
+        if not self._wait_prompt_gone(
+            PASSWORD_SELECTOR, self.detect_password, "Password", timeout
+        ):
+            logging.error(f"[ERROR] Timeout password setelah {timeout} detik")
+            return False
         logging.info("🔓⠀Password berhasil ditangani")
+        StorageState.save(self.page.context)
         return True
 
     def detect_captcha(self) -> bool:
         try:
-            return bool(self.page.query_selector("h2:has-text('Security prompt')"))
+            return bool(self.page.query_selector(CAPTCHA_SELECTOR))
         except Exception as e:
             logging.error(f"[ERROR] Error deteksi captcha: {str(e)}")
             return False
@@ -58,16 +389,34 @@ class FileCryptScraper:
             logging.info("🔓⠀CAPTCHA tidak terdeteksi")
             return True
         logging.info("🔐⠀Menunggu penyelesaian CAPTCHA...")
-        start_time = time.time()
         timeout = self.timeouts.captcha
-        while self.detect_captcha():
-            if time.time() - start_time > timeout:
-                logging.error(f"[ERROR] Timeout CAPTCHA setelah {timeout} detik")
-                return False
-            time.sleep(self.timeouts.captcha_check)
+        if not self._wait_prompt_gone(
+            CAPTCHA_SELECTOR, self.detect_captcha, "CAPTCHA", timeout
+        ):
+            logging.error(f"[ERROR] Timeout CAPTCHA setelah {timeout} detik")
+            return False
         logging.info("🔓⠀CAPTCHA berhasil diselesaikan")
+        StorageState.save(self.page.context)
         return True
 
+    def is_unchanged(self) -> bool:
+        """
+        Membandingkan daftar baris di halaman dengan fingerprint tersimpan.
+        True berarti tidak ada baris baru dan popup tidak perlu dibuka.
+        """
+        try:
+            self.page.wait_for_selector("tr.kwj3", timeout=self.timeouts.selector_wait)
+            rows = self.page.evaluate(ROW_EXTRACT_JS)
+        except Exception as e:
+            logging.debug(f"[MAIN] Gagal membaca daftar baris: {str(e)}")
+            return False
+        if self._matches_stored_fingerprint(rows):
+            logging.info(
+                f"⏭⠀ [{self._get_target_code()}] Daftar file tidak berubah, popup dilewati"
+            )
+            return True
+        return False
+
     def get_available_providers(self) -> List[str]:
         try:
             # Tunggu elemen select provider muncul
@@ -95,6 +444,8 @@ class FileCryptScraper:
         Mengambil judul dan total episode dari halaman
         Mengembalikan (judul, total_episodes)
         """
+        # Scraper dipakai ulang antar container: jangan bawa jumlah episode lama
+        self.episode_count = None
         try:
             # Tunggu hingga elemen judul muncul
             self.page.wait_for_selector("h1#x_t", timeout=self.timeouts.selector_wait)
@@ -113,6 +464,7 @@ class FileCryptScraper:
                 options = select_element.query_selector_all("option")
                 total_episodes = max(0, len(options) - 1)
 
+            self.episode_count = total_episodes
             total_episodes_str = f"{total_episodes} Episode"
 
             return self.container_title, total_episodes_str
@@ -121,6 +473,38 @@ class FileCryptScraper:
             self.container_title = "Unknown"
             return "Unknown", "0 Episode"
 
+    def _run_popup_batch(self, batch: List[ScrapedData]) -> int:
+        """Membuka popup untuk satu batch dan mengembalikan jumlah item yang gagal"""
+        popups = []
+        for item in batch:
+            item.attempts += 1
+            if not item.download_button:
+                logging.debug(f"[MAIN] Tidak ada tombol download untuk {item.title}")
+                item.download_url = "ERROR"
+                item.bypass_url = "ERROR"
+                continue
+            try:
+                with self.page.expect_popup(timeout=self.timeouts.popup) as popup_info:
+                    item.download_button.click()
+                popups.append((item, popup_info.value))
+            except Exception as e:
+                logging.debug(f"[MAIN] Gagal membuka popup untuk {item.title}: {str(e)}")
+                item.download_url = "ERROR"
+                item.bypass_url = "ERROR"
+
+        for item, popup in popups:
+            try:
+                self._apply_download_url(item, self._wait_popup_url(popup))
+                popup.close()
+            except Exception as e:
+                logging.debug(
+                    f"[MAIN] Gagal memproses popup untuk {item.title}: {str(e)}"
+                )
+                item.download_url = "ERROR"
+                item.bypass_url = "ERROR"
+
+        return sum(1 for item in batch if item.download_url == "ERROR")
+
     def scrape_file_info(
         self,
         selected_provider: Optional[str] = None,
@@ -129,191 +513,55 @@ class FileCryptScraper:
         final_data = []
         try:
             self.page.wait_for_selector("tr.kwj3", timeout=self.timeouts.selector_wait)
-            rows = self.page.query_selector_all("tr.kwj3")
-            target_code = (
-                self.page.url.strip("/").split("/")[-1].replace(".html", "").strip()
-                if self.page.url
-                else "unknown"
-            )
+            # Fase 1: Ambil semua baris dalam satu round-trip
+            rows = self.page.evaluate(ROW_EXTRACT_JS)
+            target_code = self._get_target_code()
+            self.fingerprint = self._fingerprint(rows)
             total_rows = len(rows)
             process_logger = BatchLogger(
                 total_items=total_rows * 2,
                 actual_items=total_rows,
                 process_name="SCRAPER",
+                show_progress=self.show_progress,
             )
-            all_items = []
-            items_to_scrape = []
-            skipped_items = 0
-            progress_count = 0
-            pixeldrain_bypass_index = 0  # Tambahkan indeks untuk round-robin
-
-            # Fase 1: Proses baris
-            for idx, row in enumerate(rows, 1):
-                try:
-                    provider_element = row.query_selector("td[title] a.external_link")
-                    provider = (
-                        provider_element.text_content().strip().lower()
-                        if provider_element
-                        else "N/A"
-                    )
-                    if any(p in provider for p in self.providers.send_aliases):
-                        provider = "send"
-                    provider = provider.capitalize()
-
-                    if (
-                        not selected_provider
-                        or provider.lower() == selected_provider.lower()
-                    ):
-                        title = (
-                            row.query_selector("td[title]").get_attribute("title")
-                            if row.query_selector("td[title]")
-                            else "N/A"
-                        )
-
-                        if self.database_handler.is_data_exists(
-                            title, provider, target_code
-                        ):
-                            skipped_items += 1
-                            existing_item = (
-                                self.database_handler.get_data_by_title_provider(
-                                    title, provider, target_code
-                                )
-                            )
-                            if existing_item:
-                                existing_item.container_title = self.container_title
-                                all_items.append(existing_item)
-                            continue
-
-                        item = ScrapedData(
-                            title=title,
-                            provider=provider,
-                            size=(
-                                row.query_selector("td:nth-of-type(3)")
-                                .text_content()
-                                .strip()
-                                if row.query_selector("td:nth-of-type(3)")
-                                else "N/A"
-                            ),
-                            status=(
-                                " ".join(
-                                    row.query_selector("td.status i")
-                                    .get_attribute("class")
-                                    .split()
-                                )
-                                if row.query_selector("td.status i")
-                                else "offline"
-                            ),
-                            download_url="N/A",
-                            bypass_url="N/A",
-                            target_code=target_code,
-                            container_title=self.container_title,
-                            download_button=row.query_selector("td button.download"),
-                            row_element=row,
-                        )
-                        all_items.append(item)
-                        items_to_scrape.append(item)
-
-                    progress_count += 1
-                    process_logger.log_progress(progress_count)
-                except Exception as e:
-                    logging.debug(f"[MAIN] Baris {idx} gagal: {str(e)}")
-                    continue
+            all_items, items_to_scrape, skipped_items = self._build_row_items(
+                rows, target_code, selected_provider
+            )
+            progress_count = total_rows
+            process_logger.log_progress(progress_count)
 
             if not items_to_scrape:
                 process_logger.log_complete(skipped_items)
                 return all_items
 
-            # Fase 2: Proses batch
-            batch_size = self.scraper_config.max_batch_size
-            total_batches = (len(items_to_scrape) + batch_size - 1) // batch_size
-            for batch_start in range(0, len(items_to_scrape), batch_size):
-                batch_end = min(batch_start + batch_size, len(items_to_scrape))
-                current_batch = items_to_scrape[batch_start:batch_end]
-
-                popups = []
-                for item in current_batch:
-                    try:
-                        with self.page.expect_popup(
-                            timeout=self.timeouts.popup
-                        ) as popup_info:
-                            if item.download_button:
-                                item.download_button.click()
-                            else:
-                                logging.debug(
-                                    f"[MAIN] Tidak ada tombol download untuk {item.title}"
-                                )
-                                item.download_url = "ERROR"
-                                item.bypass_url = "ERROR"
-                                continue
-                        popups.append((item, popup_info.value))
-                    except Exception as e:
-                        logging.debug(
-                            f"[MAIN] Gagal membuka popup untuk {item.title}: {str(e)}"
-                        )
-                        item.download_url = "ERROR"
-                        item.bypass_url = "ERROR"
-
-                for item, popup in popups:
-                    try:
-                        popup.wait_for_load_state(
-                            "domcontentloaded", timeout=self.timeouts.page_load
-                        )
-                        item.download_url = popup.url
-
-                        if "pixeldrain.com" in item.download_url.lower():
-                            code = item.download_url.split("/")[-1]
-                            # Gunakan URL bypass secara bergilir
-                            selected_bypass = self.pixeldrain.bypass_urls[
-                                pixeldrain_bypass_index
-                                % len(self.pixeldrain.bypass_urls)
-                            ]
-                            item.bypass_url = selected_bypass.replace("CODE-FILE", code)
-                            pixeldrain_bypass_index += 1  # Increment indeks
-
-                        # Bersihkan atribut sementara segera setelah selesai digunakan
-                        for attr in ["row_element", "download_button"]:
-                            if hasattr(item, attr):
-                                delattr(item, attr)
-
-                        popup.close()
-                    except Exception as e:
-                        logging.debug(
-                            f"[MAIN] Gagal memproses popup untuk {item.title}: {str(e)}"
-                        )
-                        item.download_url = "ERROR"
-                        item.bypass_url = "ERROR"
-
-                progress_count += len(current_batch)
-                process_logger.log_progress(min(progress_count, total_rows * 2))
-                time.sleep(self.timeouts.batch_delay)
+            # Fase 2: Proses batch per provider dengan ukuran batch adaptif
+            self.popup_resolver = self._get_popup_resolver()
+            items_by_provider = self._group_by_provider(items_to_scrape)
+            for provider, provider_items in items_by_provider.items():
+                sizer = self._get_batch_sizer(provider)
+                batch_start = 0
+                while batch_start < len(provider_items):
+                    current_batch = provider_items[
+                        batch_start : batch_start + sizer.next_size()
+                    ]
+                    batch_start += len(current_batch)
+                    started = time.monotonic()
+                    failures = self._run_popup_batch(current_batch)
+                    sizer.record(
+                        len(current_batch), failures, time.monotonic() - started
+                    )
+
+                    progress_count += len(current_batch)
+                    process_logger.log_progress(min(progress_count, total_rows * 2))
 
+            self._log_batch_summary(items_by_provider)
+
+            # Fase 3: Antrian ulang untuk item yang gagal
+            self._retry_failed_items(items_to_scrape)
             process_logger.log_complete(skipped_items)
 
             # Gabungkan data
-            scraped_keys = {
-                (item.title.lower().strip(), item.provider.lower().strip())
-                for item in items_to_scrape
-                if item.download_url != "ERROR"
-            }
-
-            for item in all_items:
-                item_key = (item.title.lower().strip(), item.provider.lower().strip())
-                if item_key in scraped_keys:
-                    for scraped_item in items_to_scrape:
-                        if (
-                            scraped_item.title.lower().strip()
-                            == item.title.lower().strip()
-                            and scraped_item.provider.lower().strip()
-                            == item.provider.lower().strip()
-                            and scraped_item.download_url != "ERROR"
-                        ):
-                            scraped_item.container_title = self.container_title
-                            final_data.append(scraped_item)
-                            break
-                else:
-                    item.container_title = self.container_title
-                    final_data.append(item)
-
+            final_data = self._merge_results(all_items, items_to_scrape)
             return final_data
 
         except Exception as e:
@@ -1,87 +1,48 @@
 import sqlite3
 from typing import List, Optional, Dict, Any
 from dataclasses import asdict
-from models.data_models import ScrapedData
+from models.data_models import BulkWriteResult, ScrapedData
+from core.connection import get_connection
+from core.database import DatabaseHandler, bulk_insert
+from core.migrations import migrate
 import logging
-import os
 
 
 class SQLiteHandler:
-    def __init__(self, db_path: str = "results/filecrypt.db"):
-        os.makedirs("results", exist_ok=True)
+    """
+    Akses berbasis dict ke tabel scraped_data. Dulu memakai tabel `files`
+    terpisah; isinya digabung oleh migrasi di core.migrations.
+    """
+
+    TABLE = "scraped_data"
+
+    def __init__(self, db_path: str = DatabaseHandler.DB_PATH):
         self.db_path = db_path
         self._init_db()
 
     def _init_db(self):
-        """Initialize database with proper schema"""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-
-            # Main table for all providers
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS files (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    title TEXT NOT NULL,
-                    provider TEXT NOT NULL,
-                    size TEXT,
-                    status TEXT,
-                    download_url TEXT,
-                    bypass_url TEXT,
-                    target_code TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(title, provider, target_code)
-                )
-            """
-            )
-
-            # Index untuk pencarian cepat
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_files_target ON files(target_code)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_files_provider ON files(provider)"
-            )
-
-            conn.commit()
+        """Initialize database with the migrated schema"""
+        migrate(self._get_connection())
 
     def _get_connection(self):
-        """Get a new database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get the shared long-lived connection for this thread"""
+        return get_connection(self.db_path)
 
-    def save_data(self, data: List[ScrapedData]):
-        """Save scraped data to SQLite"""
+    def save_data(self, data: List[ScrapedData]) -> BulkWriteResult:
+        """Save scraped data to SQLite in one transaction"""
         if not data:
-            return
-
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
+            return BulkWriteResult()
 
-            for item in data:
-                try:
-                    cursor.execute(
-                        """
-                        INSERT OR IGNORE INTO files (
-                            title, provider, size, status,
-                            download_url, bypass_url, target_code
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                        (
-                            item.title,
-                            item.provider,
-                            item.size,
-                            item.status,
-                            item.download_url,
-                            item.bypass_url,
-                            item.target_code,
-                        ),
-                    )
-                except Exception as e:
-                    logging.error(f"[SQLITE] Gagal menyimpan data: {str(e)}")
-                    continue
+        try:
+            result = bulk_insert(self._get_connection(), self.TABLE, data)
+        except sqlite3.Error as e:
+            logging.error(f"[SQLITE] Gagal menyimpan data: {str(e)}")
+            return BulkWriteResult()
 
-            conn.commit()
-            logging.info(f"[SQLITE] Disimpan {len(data)} item ke database")
+        logging.info(
+            f"[SQLITE] Disimpan {result.new_count} item baru, {result.duplicate_count} duplikat"
+        )
+        return result
 
     def get_all_data(self) -> List[Dict[str, Any]]:
         """Get all data from database"""
@@ -92,7 +53,7 @@ class SQLiteHandler:
                 SELECT
                     title, provider, size, status,
                     download_url, bypass_url, target_code
-                FROM files
+                FROM scraped_data
                 ORDER BY target_code, provider, title
             """
             )
@@ -106,7 +67,7 @@ class SQLiteHandler:
             cursor = conn.cursor()
             cursor.execute(
                 """
-                SELECT 1 FROM files
+                SELECT 1 FROM scraped_data
                 WHERE title = ? AND provider = ? AND target_code = ?
                 LIMIT 1
             """,
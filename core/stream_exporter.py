@@ -0,0 +1,97 @@
+"""
+Modul untuk export data SQLite ke CSV/JSON Lines (opsional gzip) secara streaming
+"""
+
+import csv
+import gzip
+import json
+import logging
+import os
+import sqlite3
+from typing import Optional, TextIO, Tuple
+from .excel_exporter import ROW_COLUMNS, select_rows
+
+# Format yang didukung beserta ekstensi file-nya
+FORMATS = {
+    "csv": ".csv",
+    "csv.gz": ".csv.gz",
+    "jsonl": ".jsonl",
+    "jsonl.gz": ".jsonl.gz",
+}
+# Nama kolom mengikuti SELECT di select_rows agar urutannya selalu sama
+FIELDS = [column.strip() for column in ROW_COLUMNS.split(",")]
+
+
+class StreamExporter:
+    """
+    Menulis baris langsung dari cursor SQLite ke file teks, tanpa membuat
+    objek ScrapedData; memori tetap kecil berapa pun jumlah barisnya
+    """
+
+    @staticmethod
+    def _open(path: str, fmt: str) -> TextIO:
+        if fmt.endswith(".gz"):
+            return gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=6)
+        return open(path, "w", encoding="utf-8", newline="")
+
+    @staticmethod
+    def _write_csv(handle: TextIO, cursor: sqlite3.Cursor) -> int:
+        writer = csv.writer(handle)
+        writer.writerow(FIELDS)
+        rows = 0
+        while True:
+            chunk = cursor.fetchmany(1000)
+            if not chunk:
+                return rows
+            writer.writerows(chunk)
+            rows += len(chunk)
+
+    @staticmethod
+    def _write_jsonl(handle: TextIO, cursor: sqlite3.Cursor) -> int:
+        rows = 0
+        for rows, row in enumerate(cursor, 1):
+            handle.write(json.dumps(dict(zip(FIELDS, row)), ensure_ascii=False))
+            handle.write("\n")
+        return rows
+
+    @staticmethod
+    def export(
+        conn: sqlite3.Connection,
+        filename: str,
+        fmt: str = "csv",
+        target_code: Optional[str] = None,
+        provider: Optional[str] = None,
+    ) -> Tuple[str, int]:
+        """
+        Export seluruh database, satu container, dan/atau satu provider.
+        filename tanpa ekstensi; mengembalikan (path file, jumlah baris).
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Format tidak dikenal: {fmt}")
+
+        path = f"{filename}{FORMATS[fmt]}"
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Tulis ke file sementara dulu supaya file lama tetap utuh jika gagal
+        temp_path = f"{path}.part"
+        cursor = select_rows(conn, target_code, provider)
+        try:
+            with StreamExporter._open(temp_path, fmt) as handle:
+                if fmt.startswith("csv"):
+                    rows = StreamExporter._write_csv(handle, cursor)
+                else:
+                    rows = StreamExporter._write_jsonl(handle, cursor)
+        except BaseException:
+            # File .part setengah jadi tidak boleh tertinggal
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        if not rows:
+            os.remove(temp_path)
+            return path, 0
+        os.replace(temp_path, path)
+        logging.info(f"📁⠀{rows} baris diekspor ke {path}")
+        return path, rows
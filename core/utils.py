@@ -4,7 +4,7 @@ Modul untuk utility functions
 
 import re
 import random
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from config import DEFAULT_CONFIG
 
 
@@ -24,6 +24,57 @@ def clean_filename(title: str) -> str:
     return title[:50]
 
 
+def get_target_code(url: str) -> str:
+    """
+    Mengambil target_code dari URL container
+
+    Args:
+        url (str): URL container FileCrypt
+
+    Returns:
+        str: Target code, contoh "ABC123" dari ".../Container/ABC123.html"
+    """
+    return url.strip("/").split("/")[-1].replace(".html", "").strip()
+
+
+def normalize_provider(provider_text: Optional[str]) -> str:
+    """
+    Menyeragamkan nama provider seperti yang disimpan di database: huruf
+    kapital di awal, semua alias send.* menjadi Send
+
+    Args:
+        provider_text (str): Nama provider dari halaman atau input pengguna
+
+    Returns:
+        str: Nama provider yang sudah dinormalisasi, contoh "Send"
+    """
+    provider = provider_text.strip().lower() if provider_text else "N/A"
+    if any(alias in provider for alias in DEFAULT_CONFIG.providers.send_aliases):
+        provider = "send"
+    return provider.capitalize()
+
+
+def make_item_key(
+    title: Optional[str], provider: Optional[str], target_code: Optional[str] = ""
+) -> Tuple[str, str, str]:
+    """
+    Key pembanding item (title, provider, target_code), sama persis dengan
+    primary key scraped_data. Dipakai di semua perbandingan (record lama,
+    baris kedaluwarsa, penggabungan hasil, bulk_insert) supaya item yang
+    dianggap sama di memori juga dianggap sama oleh ON CONFLICT.
+    Provider harus sudah dinormalisasi (normalize_provider).
+
+    Args:
+        title (str): Judul file
+        provider (str): Nama provider
+        target_code (str): Target code container
+
+    Returns:
+        Tuple[str, str, str]: Key item
+    """
+    return (title, provider, target_code)
+
+
 def get_random_ua() -> str:
     """
     Mendapatkan random user agent dari config
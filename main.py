@@ -2,29 +2,34 @@
 Program utama FileCrypt Scraper
 """
 
+import argparse
 import os
 import sys
 import logging
 import time
 from tabulate import tabulate
-import tkinter as tk
-from tkinter import filedialog
 import sqlite3
-import re
-import openpyxl
-from openpyxl.utils import get_column_letter
-from openpyxl.styles import Alignment
 from typing import Dict, List, Optional
 from rich.console import Console
 from rich.table import Table
 from rich.text import Text
 from rich.panel import Panel
-from core.browser import BrowserManager
+from core.browser import BrowserSession
 from core.scraper import FileCryptScraper
+from core.runner import MultiTabRunner
+from core.process_runner import ProcessRunner
+from core.async_runner import run_urls
+from core.daemon import JobDaemon
+from core.job_queue import JOB_STATUSES, JobQueue
 from core.database import DatabaseHandler
+from core.excel_exporter import ExcelExporter
+from core.stream_exporter import FORMATS as STREAM_FORMATS, StreamExporter
 from core.file_handler import FileHandler
 from core.logger import setup_logging
+from core.utils import normalize_provider
+from core.connection import get_connection
 from config.settings import DEFAULT_CONFIG
+from models.data_models import ContainerResult
 
 # Inisialisasi rich console
 console = Console()
@@ -35,7 +40,8 @@ def select_input_method() -> str:
     content = (
         "1. Masukkan satu URL langsung\n"
         "2. Pilih file berisi daftar URL (.txt)\n"
-        "3. Cek database"
+        "3. Cek database\n"
+        "4. Perbarui link kedaluwarsa"
     )
     console.print(
         Panel(
@@ -48,20 +54,36 @@ def select_input_method() -> str:
 
     while True:
         try:
-            choice = console.input("Masukkan nomor opsi (1-3): ").strip()
-            if choice in ["1", "2", "3"]:
+            choice = console.input("Masukkan nomor opsi (1-4): ").strip()
+            if choice in ["1", "2", "3", "4"]:
                 return choice
             console.print(
-                "⚠️ [yellow]Opsi tidak valid! Harap masukkan nomor 1, 2, atau 3.[/yellow]"
+                "⚠️ [yellow]Opsi tidak valid! Harap masukkan nomor 1, 2, 3, atau 4.[/yellow]"
             )
         except Exception as e:
             logging.error(f"[ERROR] Error memilih metode input: {str(e)}")
             console.print(
-                f"❌ [red]Terjadi error! Harap masukkan nomor 1, 2, atau 3.[/red]"
+                f"❌ [red]Terjadi error! Harap masukkan nomor 1, 2, 3, atau 4.[/red]"
             )
         time.sleep(1)
 
 
+def get_stale_urls() -> List[str]:
+    """URL container yang punya link melewati TTL (scrape dengan refresh=True)"""
+    containers = DatabaseHandler.get_stale_containers()
+    urls = [container.url for container in containers if container.url]
+    missing = len(containers) - len(urls)
+    if missing:
+        console.print(
+            f"⚠️ [yellow]{missing} container kedaluwarsa tidak punya URL tersimpan, dilewati[/yellow]"
+        )
+    if urls:
+        console.print(f"🔄 [white]{len(urls)} container punya link kedaluwarsa[/white]")
+    else:
+        console.print("✅ [white]Tidak ada link kedaluwarsa[/white]")
+    return urls
+
+
 def get_valid_url() -> str:
     """Meminta satu URL valid dari pengguna berdasarkan pola yang ada di config."""
     valid_patterns = DEFAULT_CONFIG.scraper.valid_urls
@@ -75,9 +97,7 @@ def get_valid_url() -> str:
         try:
             url = console.input("Masukkan URL: ").strip()
             # Memeriksa apakah URL cocok dengan salah satu pola valid dan diakhiri dengan .html
-            if any(
-                url.startswith(pattern) for pattern in valid_patterns
-            ):
+            if any(url.startswith(pattern) for pattern in valid_patterns):
                 return url
             console.print(
                 "⚠️ [yellow]URL tidak valid! Harap masukkan URL yang benar.[/yellow]"
@@ -95,8 +115,28 @@ def get_valid_url() -> str:
         time.sleep(1)
 
 
+def read_urls_file(file_path: str) -> List[str]:
+    """Membaca URL valid dari file .txt (satu URL per baris)"""
+    valid_urls = []
+    valid_patterns = DEFAULT_CONFIG.scraper.valid_urls
+    with open(file_path, "r", encoding="utf-8") as file:
+        for line in file:
+            url = line.strip()
+            if not url:
+                continue
+            if any(url.startswith(pattern) for pattern in valid_patterns):
+                valid_urls.append(url)
+            else:
+                logging.warning(f"[WARNING] URL tidak valid di file: {url}")
+    return valid_urls
+
+
 def get_urls_from_file() -> List[str]:
     """Membuka file explorer dan membaca URL dari file .txt"""
+    # tkinter hanya dibutuhkan untuk dialog, jadi CLI tetap jalan tanpa display
+    import tkinter as tk
+    from tkinter import filedialog
+
     root = tk.Tk()
     root.withdraw()
     file_path = filedialog.askopenfilename(
@@ -109,18 +149,8 @@ def get_urls_from_file() -> List[str]:
         console.print("❌⠀ [red]Tidak ada file yang dipilih. Program berhenti.[/red]")
         sys.exit(1)
 
-    valid_urls = []
-    valid_patterns = DEFAULT_CONFIG.scraper.valid_urls
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            for line in file:
-                url = line.strip()
-                if any(
-                    url.startswith(pattern) for pattern in valid_patterns
-                ):
-                    valid_urls.append(url)
-                else:
-                    logging.warning(f"[WARNING] URL tidak valid di file: {url}")
+        valid_urls = read_urls_file(file_path)
         if not valid_urls:
             logging.error("❌⠀ Tidak ada URL valid di file")
             console.print(
@@ -138,7 +168,8 @@ def select_output_option() -> str:
     """Meminta pengguna memilih opsi pencetakan output"""
     console.print(
         Panel(
-            "\n1. Cetak semua data di database \n2. Cetak file individual saja \n3. Cetak keduanya \n4. Simpan data ke database ",
+            "\n1. Cetak semua data di database \n2. Cetak file individual saja \n3. Cetak keduanya \n4. Simpan data ke database "
+            "\n5. Ekspor semua data ke CSV/JSONL \n6. Ekspor per container ke CSV/JSONL ",
             title="[bold blue]PILIH OPSI FILE OUTPUT[/bold blue]",
             border_style="cyan",
             expand=True,
@@ -147,140 +178,189 @@ def select_output_option() -> str:
 
     while True:
         try:
-            choice = console.input("Masukkan nomor opsi (1-4): ").strip()
-            if choice in ["1", "2", "3", "4"]:
+            choice = console.input("Masukkan nomor opsi (1-6): ").strip()
+            if choice in ["1", "2", "3", "4", "5", "6"]:
                 return choice
             console.print(
-                "⚠️ [yellow]Opsi tidak valid! Harap masukkan nomor 1, 2, 3, atau 4.[/yellow]"
+                "⚠️ [yellow]Opsi tidak valid! Harap masukkan nomor 1 sampai 6.[/yellow]"
             )
         except Exception as e:
             logging.error(f"❌⠀ Error memilih opsi pencetakan: {str(e)}")
             console.print(
-                f"❌⠀ [red]Terjadi error! Harap masukkan nomor 1, 2, 3, atau 4.[/red]"
+                f"❌⠀ [red]Terjadi error! Harap masukkan nomor 1 sampai 6.[/red]"
             )
         time.sleep(1)
 
 
-def process_single_url(url: str) -> tuple[List, str]:
-    """Memproses scraping untuk satu URL, mengembalikan scraped_data dan container_title"""
+def select_stream_format() -> str:
+    """Meminta format export streaming (CSV/JSONL, opsional gzip)"""
+    formats = list(STREAM_FORMATS)
+    content = "\n".join(f"{i}. {fmt}" for i, fmt in enumerate(formats, 1))
+    console.print(
+        Panel(
+            content,
+            title="[bold blue]PILIH FORMAT EXPORT[/bold blue]",
+            border_style="cyan",
+            expand=True,
+        )
+    )
+    choice = console.input(f"Masukkan nomor format (1-{len(formats)}): ").strip()
+    if choice.isdigit() and 1 <= int(choice) <= len(formats):
+        return formats[int(choice) - 1]
+    console.print("⚠️ [yellow]Format tidak valid! Memakai csv.[/yellow]")
+    return "csv"
+
+
+def stream_export(
+    name: str,
+    target_code: Optional[str] = None,
+    fmt: Optional[str] = None,
+    provider: Optional[str] = None,
+):
+    """Export streaming ke results/<name>.<format>, bisa difilter per provider"""
+    conn = connect_db(DatabaseHandler.DB_PATH)
+    if not conn:
+        return
+    fmt = fmt or select_stream_format()
+    if provider:
+        provider = normalize_provider(provider)
+        name = f"{name}.{provider}"
+    try:
+        started = time.perf_counter()
+        path, rows = StreamExporter.export(
+            conn,
+            os.path.join("results", sanitize_filename(name)),
+            fmt,
+            target_code=target_code,
+            provider=provider,
+        )
+        if rows:
+            console.print(
+                f"✅ [white]{rows} baris diekspor ke {path} ({time.perf_counter() - started:.1f}s)[/white]"
+            )
+        elif provider:
+            available = ExcelExporter._providers(conn, target_code)
+            console.print(
+                f"⚠️ [yellow]Tidak ada data untuk provider {provider}; "
+                f"provider tersedia: {', '.join(available) or '-'}[/yellow]"
+            )
+            logging.warning(f"[WARNING] Filter provider {provider} tidak cocok ({name})")
+        else:
+            console.print(f"⚠️ [yellow]Tidak ada data untuk {name}[/yellow]")
+    except (OSError, sqlite3.Error) as e:
+        console.print(f"❌⠀ [red]Error export {fmt}: {e}[/red]")
+        logging.error(f"❌⠀ Gagal export {fmt}: {str(e)}")
+
+
+def select_export_provider() -> Optional[str]:
+    provider = console.input(
+        "Filter provider (kosongkan untuk semua provider): "
+    ).strip()
+    return provider or None
+
+
+def process_single_url(
+    url: str,
+    session: BrowserSession,
+    selected_provider: Optional[str] = None,
+    interactive: bool = True,
+    refresh: Optional[bool] = None,
+) -> ContainerResult:
+    """
+    Memproses scraping untuk satu URL, mengembalikan ContainerResult.
+    Tanpa interactive, selected_provider dipakai langsung tanpa prompt.
+    refresh None mengikuti freshness.refresh_on_scrape.
+    """
     target_code = url.strip("/").split("/")[-1].replace(".html", "")
     logging.info(f"⚙⠀ Memulai proses untuk target_code: {target_code}")
 
-    with BrowserManager() as browser_manager:
-        scraper = None
-        try:
-            for attempt in range(3):
-                try:
-                    scraper = FileCryptScraper(browser_manager.context.new_page())
-                    break
-                except Exception as e:
-                    logging.warning(
-                        f"[WARNING] Gagal membuka halaman baru, mencoba lagi ({attempt + 1}/3): {str(e)}"
-                    )
-                    time.sleep(2)
-            else:
-                raise RuntimeError("Gagal membuka halaman baru setelah 3 percobaan")
-
-            for attempt in range(3):
-                try:
-                    scraper.page.goto(url, wait_until="load", timeout=15000)
-                    break
-                except Exception as e:
-                    logging.warning(
-                        f"[WARNING] Gagal memuat URL, mencoba lagi ({attempt + 1}/3): {str(e)}"
-                    )
-                    time.sleep(2)
-            else:
-                raise RuntimeError("Gagal memuat URL setelah 3 percobaan")
+    page = None
+    try:
+        page = session.new_page()
+        scraper = FileCryptScraper(page, refresh)
 
-            browser_manager.close_about_blank_tabs()
-            time.sleep(1)
+        for attempt in range(3):
+            try:
+                scraper.page.goto(url, wait_until="load", timeout=15000)
+                break
+            except Exception as e:
+                logging.warning(
+                    f"[WARNING] Gagal memuat URL, mencoba lagi ({attempt + 1}/3): {str(e)}"
+                )
+                time.sleep(2)
+        else:
+            raise RuntimeError("Gagal memuat URL setelah 3 percobaan")
 
-            if not scraper.handle_password():
-                raise RuntimeError("Gagal menangani password")
-            if not scraper.handle_captcha():
-                raise RuntimeError("Gagal menangani CAPTCHA")
+        session.manager.close_about_blank_tabs()
+        scraper.wait_until_ready()
 
-            title, total_episodes = scraper.get_additional_info()
-            container_title = (
-                title
-                if title and title.strip().lower() not in ("n/a", "unknown", "")
-                else target_code
-            )
+        if not scraper.handle_password():
+            raise RuntimeError("Gagal menangani password")
+        if not scraper.handle_captcha():
+            raise RuntimeError("Gagal menangani CAPTCHA")
+
+        title, total_episodes = scraper.get_additional_info()
+        container_title = (
+            title
+            if title and title.strip().lower() not in ("n/a", "unknown", "")
+            else target_code
+        )
+
+        print_info(
+            {
+                "Judul": title,
+                "Total Episode": total_episodes,
+                "Target Code": target_code,
+            }
+        )
 
-            print_info(
-                {
-                    "Judul": title,
-                    "Total Episode": total_episodes,
-                    "Target Code": target_code,
-                }
+        if scraper.is_unchanged():
+            return ContainerResult(
+                url=url,
+                target_code=target_code,
+                container_title=container_title,
+                episode_count=scraper.episode_count,
+                unchanged=True,
             )
 
-            providers = scraper.get_available_providers()
+        providers = scraper.get_available_providers()
+        if interactive:
             selected_provider = select_provider(providers)
 
-            logging.info(f"⚙⠀ Memulai proses scraping untuk target_code: {target_code}")
-            logging.info(f"⚙⠀ Total item di halaman: {total_count}")
-            scraped_data = scraper.scrape_file_info(
-                selected_provider=selected_provider,
-                all_providers=providers if not selected_provider else None,
-            )
-            return scraped_data, container_title
-        except Exception as e:
-            logging.error(f"❌⠀ Gagal memproses URL {url}: {str(e)}")
-            return [], target_code
-        finally:
-            if scraper and scraper.page:
-                try:
-                    scraper.page.close()
-                except Exception as e:
-                    logging.warning(f"[WARNING] Gagal menutup halaman: {str(e)}")
-            try:
-                for page in browser_manager.context.pages:
-                    if not page.is_closed():
-                        page.close()
-            except Exception as e:
-                logging.warning(f"[WARNING] Gagal menutup halaman sisa: {str(e)}")
+        logging.info(f"⚙⠀ Memulai proses scraping untuk target_code: {target_code}")
+        logging.info(f"⚙⠀ Total item di halaman: {total_episodes}")
+        scraped_data = scraper.scrape_file_info(
+            selected_provider=selected_provider,
+            all_providers=providers if not selected_provider else None,
+        )
+        return ContainerResult(
+            url=url,
+            target_code=target_code,
+            container_title=container_title,
+            data=scraped_data,
+            episode_count=scraper.episode_count,
+            fingerprint=scraper.completed_fingerprint(scraped_data, selected_provider),
+        )
+    except Exception as e:
+        logging.error(f"❌⠀ Gagal memproses URL {url}: {str(e)}")
+        return ContainerResult(
+            url=url, target_code=target_code, container_title=target_code, error=str(e)
+        )
+    finally:
+        session.release_page(page)
+        session.mark_container_done()
 
 
 def connect_db(db_name: str) -> Optional[sqlite3.Connection]:
-    """Fungsi untuk koneksi ke database"""
+    """Fungsi untuk mengambil koneksi bersama ke database (jangan ditutup)"""
     try:
-        conn = sqlite3.connect(db_name)
-        return conn
+        return get_connection(db_name)
     except sqlite3.Error as e:
         console.print(f"❌⠀ [red]Error koneksi database: {e}[/red]")
         logging.error(f"❌⠀ Error koneksi database: {str(e)}")
         return None
 
 
-def modify_title(title: str) -> str:
-    """Fungsi untuk memodifikasi title sesuai pola yang diinginkan"""
-    if not title:
-        return title
-
-    patterns_to_remove = [
-        r"\[MkvDrama\.Org\]",
-        r"\[MkvDrama\.me\]",
-        r"\.mkv\b",
-        r"\.x264\b",
-        r"\.1080p\b",
-        r"\.720p\b",
-        r"\b.E01\b",
-    ]
-    cleaned_title = title
-    for pattern in patterns_to_remove:
-        cleaned_title = re.sub(pattern, "", cleaned_title, flags=re.IGNORECASE)
-
-    match = re.match(r"^(.*?S01)(?:E\d{2})?\.?([A-Z]+)?", cleaned_title.strip())
-    if match:
-        base_title = match.group(1)
-        provider = match.group(2) or ""
-        return f"{base_title}{'.' + provider if provider else ''}"
-
-    return cleaned_title.strip()
-
-
 def sanitize_filename(filename: str) -> str:
     """Mengganti karakter tidak valid untuk nama file, tapi pertahankan titik"""
     invalid_chars = '<>:"/\\|?*'
@@ -289,193 +369,18 @@ def sanitize_filename(filename: str) -> str:
     return filename
 
 
-def is_sheet_empty(sheet: openpyxl.worksheet.worksheet.Worksheet) -> bool:
-    return sheet.max_row <= 1
-
-
-def save_to_excel(data: List[tuple], filename: str):
-    """Fungsi untuk menyimpan data ke file Excel dengan struktur seperti save_individual_files"""
+def save_to_excel(filename: str, target_code: Optional[str] = None):
+    """Fungsi untuk menyimpan data database (atau satu target_code) ke file Excel"""
+    conn = connect_db(DatabaseHandler.DB_PATH)
+    if not conn:
+        return
     try:
-        os.makedirs("results", exist_ok=True)
         filename = os.path.join("results", f"{sanitize_filename(filename)}.xlsx")
-
-        if os.path.exists(filename):
-            wb = openpyxl.load_workbook(filename)
-            for sheet_name in wb.sheetnames[:]:
-                sheet = wb[sheet_name]
-                if is_sheet_empty(sheet) or sheet_name.lower() == "sheet":
-                    wb.remove(sheet)
-        else:
-            wb = openpyxl.Workbook()
-            wb.remove(wb.active)
-
-        all_sheet_name = "ALL_PROVIDER_RESULTS"
-        if all_sheet_name not in wb.sheetnames:
-            all_sheet = wb.create_sheet(all_sheet_name, 0)
-            all_sheet.append(
-                [
-                    "No",
-                    "Title",
-                    "Provider",
-                    "Size",
-                    "Status",
-                    "Download URL",
-                    "Bypass URL",
-                    "_target_code",
-                ]
-            )
-        else:
-            all_sheet = wb[all_sheet_name]
-
-        existing_all_entries = set()
-        for row in all_sheet.iter_rows(min_row=2, values_only=True):
-            if row[1] and row[2] and row[7]:
-                existing_all_entries.add(
-                    (
-                        str(row[1]).lower().strip(),
-                        str(row[2]).lower().strip(),
-                        str(row[7]).lower().strip(),
-                    )
-                )
-
-        new_all_items = 0
-        for item in data:
-            item_key = (
-                str(item[0]).lower().strip(),
-                str(item[1]).lower().strip(),
-                str(item[6]).lower().strip(),
-            )
-            if item_key not in existing_all_entries:
-                all_sheet.append(
-                    [
-                        all_sheet.max_row,
-                        item[0],
-                        item[1],
-                        item[2],
-                        item[3],
-                        item[4],
-                        item[5],
-                        item[6],
-                    ]
-                )
-                existing_all_entries.add(item_key)
-                new_all_items += 1
-
-        for idx, row in enumerate(all_sheet.iter_rows(min_row=2), 1):
-            row[0].value = idx
-
-        if is_sheet_empty(all_sheet):
-            wb.remove(all_sheet)
-
-        providers = {item[1] for item in data if item[1]}
-        for provider in providers:
-            provider_items = [item for item in data if item[1] == provider]
-            provider_sheet_name = provider[:31]
-            existing_provider_entries = set()
-
-            if provider_sheet_name in wb.sheetnames:
-                provider_sheet = wb[provider_sheet_name]
-                for row in provider_sheet.iter_rows(min_row=2, values_only=True):
-                    if row[1] and row[2] and row[7]:
-                        existing_provider_entries.add(
-                            (
-                                str(row[1]).lower().strip(),
-                                str(row[2]).lower().strip(),
-                                str(row[7]).lower().strip(),
-                            )
-                        )
-
-            provider_new_items = False
-            for item in provider_items:
-                item_key = (
-                    str(item[0]).lower().strip(),
-                    str(item[1]).lower().strip(),
-                    str(item[6]).lower().strip(),
-                )
-                if item_key not in existing_provider_entries:
-                    provider_new_items = True
-                    break
-
-            if provider_new_items:
-                if provider_sheet_name not in wb.sheetnames:
-                    provider_sheet = wb.create_sheet(provider_sheet_name)
-                    provider_sheet.append(
-                        [
-                            "No",
-                            "Title",
-                            "Provider",
-                            "Size",
-                            "Status",
-                            "Download URL",
-                            "Bypass URL",
-                            "_target_code",
-                        ]
-                    )
-                else:
-                    provider_sheet = wb[provider_sheet_name]
-
-                for item in provider_items:
-                    item_key = (
-                        str(item[0]).lower().strip(),
-                        str(item[1]).lower().strip(),
-                        str(item[6]).lower().strip(),
-                    )
-                    if item_key not in existing_provider_entries:
-                        provider_sheet.append(
-                            [
-                                provider_sheet.max_row,
-                                item[0],
-                                item[1],
-                                item[2],
-                                item[3],
-                                item[4],
-                                item[5],
-                                item[6],
-                            ]
-                        )
-                        existing_provider_entries.add(item_key)
-
-                for idx, row in enumerate(provider_sheet.iter_rows(min_row=2), 1):
-                    row[0].value = idx
-
-                if is_sheet_empty(provider_sheet):
-                    wb.remove(provider_sheet)
-
-        has_data = False
-        for sheet_name in wb.sheetnames[:]:
-            sheet = wb[sheet_name]
-            if not is_sheet_empty(sheet):
-                has_data = True
-            else:
-                wb.remove(sheet)
-
-        if not has_data or not wb.sheetnames:
+        written = ExcelExporter.export(conn, filename, target_code)
+        if not written:
             console.print("⚠️ [yellow]Tidak ada data untuk disimpan.[/yellow]")
             logging.info("[EXCEL] Tidak ada data untuk disimpan ke Excel")
             return
-
-        if "Sheet" in wb.sheetnames:
-            wb.remove(wb["Sheet"])
-
-        for sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-            column_widths = {
-                "A": 5,
-                "B": 60,
-                "C": 15,
-                "D": 10,
-                "E": 15,
-                "F": 60,
-                "G": 60,
-                "H": 15,
-            }
-            for col, width in column_widths.items():
-                ws.column_dimensions[col].width = width
-            for row in ws.iter_rows():
-                for cell in row:
-                    cell.alignment = Alignment(wrap_text=True, vertical="top")
-
-        wb.save(filename)
         console.print(f"✅ [white]Data disimpan ke {filename}[/white]")
         logging.info(f"[EXCEL] Data disimpan ke {filename}")
 
@@ -486,60 +391,12 @@ def save_to_excel(data: List[tuple], filename: str):
 
 def save_all_data():
     """Fungsi untuk menyimpan semua data dari database ke RESULT_DATABASE.xlsx"""
-    conn = connect_db("results/scraped_data.db")
-    if conn:
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT title, provider, size, status, download_url, bypass_url, target_code
-                FROM scraped_data
-            """
-            )
-            rows = cursor.fetchall()
-
-            if rows:
-                save_to_excel(rows, "RESULT_DATABASE")
-            else:
-                console.print("⚠️ [yellow]Tidak ada data di database[/yellow]")
-                logging.info("📥 Tidak ada data di database")
+    save_to_excel("RESULT_DATABASE")
 
-        except sqlite3.Error as e:
-            console.print(f"❌⠀ [red]Error membaca data: {e}[/red]")
-            logging.error(f"❌⠀ Error membaca data: {str(e)}")
-        finally:
-            conn.close()
 
-
-def display_and_save_by_target_code(target_code: str, modified_title: str):
+def display_and_save_by_target_code(target_code: str, title: str):
     """Fungsi untuk menyimpan data dengan target_code tertentu ke Excel"""
-    conn = connect_db("results/scraped_data.db")
-    if conn:
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT title, provider, size, status, download_url, bypass_url, target_code
-                FROM scraped_data
-                WHERE target_code = ?
-            """,
-                (target_code,),
-            )
-            rows = cursor.fetchall()
-
-            if rows:
-                save_to_excel(rows, modified_title)
-            else:
-                console.print(
-                    f"⚠️ [yellow]Tidak ada data dengan target_code: {target_code}[/yellow]"
-                )
-                logging.info(f"📥 Tidak ada data dengan target_code: {target_code}")
-
-        except sqlite3.Error as e:
-            console.print(f"❌⠀ [red]Error membaca data: {e}[/red]")
-            logging.error(f"❌⠀ Error membaca data: {str(e)}")
-        finally:
-            conn.close()
+    save_to_excel(title, target_code)
 
 
 def display_data():
@@ -549,17 +406,9 @@ def display_data():
 
     if conn:
         try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT MIN(title), target_code
-                FROM scraped_data
-                GROUP BY target_code
-                """
-            )
-            rows = cursor.fetchall()
+            containers = DatabaseHandler.get_containers()
 
-            if not rows:
+            if not containers:
                 console.print("⚠️ [yellow]Tidak ada data di database.[/yellow]")
                 logging.info("📥 Tidak ada data di database")
                 return
@@ -572,22 +421,49 @@ def display_data():
             table.add_column("No", style="cyan", justify="center")
             table.add_column("Title", style="green")
             table.add_column("Target Code", style="magenta")
+            table.add_column("Episode", justify="right")
+            table.add_column("Item", justify="right")
+            table.add_column("Provider", style="white")
+            table.add_column("Terakhir Scrape", style="white")
 
             selections = []
-            for idx, row in enumerate(rows, 1):
-                title, target_code = row
-                modified_title = modify_title(title)
-                table.add_row(str(idx), modified_title, target_code)
-                selections.append((modified_title, target_code))
+            for idx, container in enumerate(containers, 1):
+                title = container.title or container.target_code
+                table.add_row(
+                    str(idx),
+                    title,
+                    container.target_code,
+                    str(container.episode_count or "-"),
+                    str(container.row_count),
+                    ", ".join(container.providers),
+                    container.last_scraped_at or "-",
+                )
+                selections.append((title, container.target_code))
 
             console.print(table)
             console.print("\n0. Simpan semua data ke RESULT_DATABASE.xlsx")
+            console.print("c. Ekspor semua data ke CSV/JSONL")
+            console.print("c<nomor>. Ekspor satu container ke CSV/JSONL (contoh: c2)")
             console.print("m. Kembali ke menu utama")
 
             try:
                 choice = console.input("\nMasukkan nomor untuk cetak data: ").strip()
                 if choice == "0":
                     save_all_data()
+                elif choice.lower() == "c":
+                    stream_export("RESULT_DATABASE", provider=select_export_provider())
+                elif choice.lower().startswith("c"):
+                    index = int(choice[1:])
+                    if 1 <= index <= len(selections):
+                        selected_title, selected_target_code = selections[index - 1]
+                        stream_export(
+                            selected_title,
+                            selected_target_code,
+                            provider=select_export_provider(),
+                        )
+                    else:
+                        console.print("⚠️ [yellow]Pilihan tidak valid![/yellow]")
+                        logging.warning("[INPUT] Pilihan tidak valid")
                 elif choice == "m":
                     logging.debug("Pengguna memilih kembali ke menu utama")
                     main()
@@ -608,8 +484,170 @@ def display_data():
         except sqlite3.Error as e:
             console.print(f"❌⠀ [red]Error membaca data: {e}[/red]")
             logging.error(f"❌⠀ Error membaca data: {str(e)}")
-        finally:
-            conn.close()
+
+
+def scrape_urls(
+    urls: List[str],
+    use_runner: bool = False,
+    selected_provider: Optional[str] = None,
+    interactive: bool = True,
+    refresh: Optional[bool] = None,
+) -> tuple[List[str], Dict[str, str]]:
+    """
+    Scrape daftar URL dan simpan hasilnya ke database.
+    refresh=True me-resolve ulang link kedaluwarsa hanya untuk URL ini.
+    Mengembalikan (target_code yang diproses, judul per target_code).
+    """
+    processed_target_codes = []
+    container_titles = {}
+    parked_results = []
+
+    def handle_result(result: ContainerResult):
+        if result.needs_attention:
+            parked_results.append(result)
+        if result.unchanged:
+            DatabaseHandler.touch_container(result.target_code)
+            console.print(
+                f"⏭ [white]{result.target_code}: tidak ada perubahan, dilewati[/white]"
+            )
+            processed_target_codes.append(result.target_code)
+            container_titles[result.target_code] = result.container_title
+        elif result.data:
+            new_items = DatabaseHandler.save_result(result)
+            console.print(
+                f"✅ [white]{result.target_code}: {new_items} item baru dari {len(result.data)} item[/white]"
+            )
+            processed_target_codes.append(result.target_code)
+            container_titles[result.target_code] = result.container_title
+        else:
+            console.print(
+                f"⚠️ [yellow]{result.target_code}: tidak ada data yang berhasil di-scrape[/yellow]"
+            )
+            logging.info(f"⚙⠀ Tidak ada data yang di-scrape untuk {result.target_code}")
+
+    if not urls:
+        return processed_target_codes, container_titles
+
+    if use_runner:
+        if DEFAULT_CONFIG.scraper.processes > 1 and len(urls) > 1:
+            ProcessRunner(
+                selected_provider=selected_provider,
+                on_result=handle_result,
+                refresh=refresh,
+            ).run(urls)
+        elif DEFAULT_CONFIG.scraper.engine == "async":
+            run_urls(
+                urls,
+                selected_provider=selected_provider,
+                on_result=handle_result,
+                refresh=refresh,
+            )
+        else:
+            if DEFAULT_CONFIG.scraper.concurrent_tabs > 1:
+                logging.warning(
+                    "[WARNING] Engine sync memproses satu tab pada satu waktu "
+                    f"(concurrent_tabs={DEFAULT_CONFIG.scraper.concurrent_tabs} "
+                    "hanya memuat URL berikutnya lebih awal); pakai engine async "
+                    "untuk tab yang benar-benar bersamaan"
+                )
+            with BrowserSession() as session:
+                MultiTabRunner(
+                    session,
+                    selected_provider=selected_provider,
+                    on_result=handle_result,
+                    refresh=refresh,
+                ).run(urls)
+    else:
+        with BrowserSession() as session:
+            for idx, url in enumerate(urls, 1):
+                logging.debug(f"⚙⠀ Memproses URL {idx}/{len(urls)}: {url}")
+                console.print(
+                    f"🚀 [white]Memproses URL {idx}/{len(urls)}: {url}[/white]"
+                )
+                handle_result(
+                    process_single_url(
+                        url, session, selected_provider, interactive, refresh
+                    )
+                )
+
+    print_parked_summary(parked_results)
+    return processed_target_codes, container_titles
+
+
+def print_parked_summary(results: List[ContainerResult]):
+    """Ringkasan container yang sempat diparkir menunggu password/CAPTCHA"""
+    if not results:
+        return
+    table = Table(
+        title=Text("Container yang Butuh Perhatian", style="bold yellow"),
+        show_header=True,
+        header_style="bold cyan",
+    )
+    table.add_column("Target Code", style="magenta")
+    table.add_column("Alasan", style="white")
+    table.add_column("Hasil", style="white")
+    for result in results:
+        table.add_row(
+            result.target_code,
+            result.needs_attention,
+            f"[red]{result.error}[/red]" if result.error else "[green]Selesai[/green]",
+        )
+    console.print(table)
+    failed = [result.url for result in results if result.error]
+    if failed:
+        console.print(
+            f"⚠️ [yellow]{len(failed)} container belum selesai, jalankan ulang URL berikut:[/yellow]"
+        )
+        for url in failed:
+            console.print(f"   {url}")
+
+
+def save_database_excel():
+    if DatabaseHandler.export_to_excel():
+        console.print(
+            f"✅ [white]Berhasil menyimpan file database di results\\RESULT_DATABASE.xlsx[/white]"
+        )
+        logging.debug(
+            f"📁⠀Berhasil menyimpan file database di results\\RESULT_DATABASE.xlsx"
+        )
+    else:
+        console.print("⚠️ [yellow]Tidak ada data di database[/yellow]")
+        logging.info("📁⠀Tidak ada data di database")
+
+
+def write_outputs(
+    output_option: str,
+    processed_target_codes: List[str],
+    container_titles: Dict[str, str],
+    fmt: Optional[str] = None,
+    provider: Optional[str] = None,
+    interactive: bool = True,
+):
+    """Menjalankan opsi output 1-6 dari select_output_option"""
+    if output_option == "1":
+        save_database_excel()
+    elif output_option == "2":
+        save_individual_outputs(processed_target_codes, container_titles)
+    elif output_option == "3":
+        save_database_excel()
+        save_individual_outputs(processed_target_codes, container_titles)
+    elif output_option == "4":
+        console.print("✅ [white]Data berhasil tersimpan di DATABASE[/white]")
+        logging.debug("⚙⠀ Data berhasil tersimpan di DATABASE")
+    elif output_option in ("5", "6"):
+        if interactive:
+            fmt = select_stream_format()
+            provider = select_export_provider()
+        if output_option == "5":
+            stream_export("RESULT_DATABASE", fmt=fmt or "csv", provider=provider)
+        else:
+            for target_code in dict.fromkeys(processed_target_codes):
+                stream_export(
+                    container_titles.get(target_code, target_code),
+                    target_code,
+                    fmt=fmt or "csv",
+                    provider=provider,
+                )
 
 
 def main():
@@ -628,104 +666,25 @@ def main():
         elif input_method == "3":
             display_data()
             return
-
-        processed_target_codes = []
-        container_titles = {}
-        for idx, url in enumerate(urls, 1):
-            logging.debug(f"⚙⠀ Memproses URL {idx}/{len(urls)}: {url}")
-            console.print(f"🚀 [white]Memproses URL {idx}/{len(urls)}: {url}[/white]")
-            scraped_data, container_title = process_single_url(url)
-
-            if scraped_data:
-                new_items = DatabaseHandler.save_to_sqlite(scraped_data)
-                console.print(
-                    f"✅ [white]Berhasil menyimpan {new_items} item baru[/white]"
-                )
-                if new_items == 0:
-                    console.print("⚠️ [yellow]Tidak ada item baru[/yellow]")
-                    logging.debug(f"⚙⠀ Tidak ada item baru")
-                target_code = url.strip("/").split("/")[-1].replace(".html", "")
-                processed_target_codes.append(target_code)
-                container_titles[target_code] = container_title
-            else:
-                console.print("⚠️ [yellow]Tidak ada data yang di-scrape[/yellow]")
-                logging.info(f"⚙⠀ Tidak ada data yang di-scrape")
-                console.print(
-                    f"⚠️ [yellow]Tidak ada data yang berhasil di-scrape[/yellow]"
-                )
-
-            time.sleep(3)
+        elif input_method == "4":
+            urls = get_stale_urls()
+        refresh = True if input_method == "4" else None
+
+        use_runner = input_method in ("2", "4") and (
+            DEFAULT_CONFIG.scraper.concurrent_tabs > 1
+            or DEFAULT_CONFIG.scraper.processes > 1
+            or DEFAULT_CONFIG.scraper.engine == "async"
+        )
+        selected_provider = select_provider_filter() if use_runner else None
+        processed_target_codes, container_titles = scrape_urls(
+            urls, use_runner, selected_provider, refresh=refresh
+        )
 
         if urls:
             if processed_target_codes:
-                output_option = select_output_option()
-                if output_option == "1":
-                    all_data = DatabaseHandler.get_all_data()
-                    if all_data:
-                        DatabaseHandler.export_to_excel(
-                            all_data, processed_target_codes[0]
-                        )
-                        console.print(
-                            f"✅ [white]Berhasil menyimpan file database di results\\RESULT_DATABASE.xlsx[/white]"
-                        )
-                        logging.debug(
-                            f"📁⠀Berhasil menyimpan file database di results\\RESULT_DATABASE.xlsx"
-                        )
-                    else:
-                        console.print("⚠️ [yellow]Tidak ada data di database[/yellow]")
-                        logging.info("📁⠀Tidak ada data di database")
-                elif output_option == "2":
-                    for target_code in processed_target_codes:
-                        scraped_data = DatabaseHandler.get_data_by_target_code(
-                            target_code
-                        )
-                        if scraped_data:
-                            container_title = container_titles.get(
-                                target_code, target_code
-                            )
-                            FileHandler.save_individual_files(
-                                scraped_data, target_code, container_title
-                            )
-                            console.print(
-                                f"✅ [white]Berhasil menyimpan file individual di results\\{FileHandler._sanitize_filename(container_title, target_code)}.xlsx[/white]"
-                            )
-                            logging.debug(
-                                f"📁⠀Berhasil menyimpan file individual di results\\{FileHandler._sanitize_filename(container_title, target_code)}.xlsx"
-                            )
-                elif output_option == "3":
-                    all_data = DatabaseHandler.get_all_data()
-                    if all_data:
-                        DatabaseHandler.export_to_excel(
-                            all_data, processed_target_codes[0]
-                        )
-                        console.print(
-                            f"✅ [white]Berhasil menyimpan file database di results\\RESULT_DATABASE.xlsx[/white]"
-                        )
-                        logging.debug(
-                            f"📁⠀Berhasil menyimpan file database di results\\RESULT_DATABASE.xlsx"
-                        )
-                    for target_code in processed_target_codes:
-                        scraped_data = DatabaseHandler.get_data_by_target_code(
-                            target_code
-                        )
-                        if scraped_data:
-                            container_title = container_titles.get(
-                                target_code, target_code
-                            )
-                            FileHandler.save_individual_files(
-                                scraped_data, target_code, container_title
-                            )
-                            console.print(
-                                f"✅ [white]Berhasil menyimpan file individual di results\\{FileHandler._sanitize_filename(container_title, target_code)}.xlsx[/white]"
-                            )
-                            logging.debug(
-                                f"📁⠀Berhasil menyimpan file individual di results\\{FileHandler._sanitize_filename(container_title, target_code)}.xlsx"
-                            )
-                elif output_option == "4":
-                    console.print(
-                        "✅ [white]Data berhasil tersimpan di DATABASE[/white]"
-                    )
-                    logging.debug("⚙⠀ Data berhasil tersimpan di DATABASE")
+                write_outputs(
+                    select_output_option(), processed_target_codes, container_titles
+                )
             else:
                 console.print(
                     "⚠️ [yellow]Tidak ada data yang berhasil di-scrape dari URL manapun[/yellow]"
@@ -748,6 +707,32 @@ def main():
         sys.exit(1)
 
 
+def save_individual_outputs(target_codes: List[str], container_titles: Dict[str, str]):
+    """Membuat file individual untuk setiap target_code secara paralel"""
+    # Judul kosong dicari FileHandler dari tabel containers
+    containers = {
+        target_code: container_titles.get(target_code)
+        for target_code in dict.fromkeys(target_codes)
+    }
+    for result in FileHandler.export_individual_files(containers):
+        if result.error:
+            console.print(
+                f"❌⠀ [red]Gagal menyimpan file individual {result.target_code}: {result.error}[/red]"
+            )
+        elif result.rows:
+            console.print(
+                f"✅ [white]Berhasil menyimpan file individual di {result.filename} "
+                f"({result.rows} baris, {result.seconds:.1f}s)[/white]"
+            )
+            logging.debug(
+                f"📁⠀Berhasil menyimpan file individual di {result.filename} ({result.seconds:.2f}s)"
+            )
+        else:
+            console.print(
+                f"⚠️ [yellow]Tidak ada data untuk {result.target_code}[/yellow]"
+            )
+
+
 def print_info(info: Dict[str, str]):
     """Menampilkan informasi URL dengan rich"""
     content = "\n".join(
@@ -764,6 +749,18 @@ def print_info(info: Dict[str, str]):
     )
 
 
+def select_provider_filter() -> Optional[str]:
+    """Meminta satu filter provider yang berlaku untuk semua URL dalam mode multi-tab"""
+    try:
+        provider_input = console.input(
+            "Masukkan nama provider untuk semua URL (kosongkan untuk semua): "
+        ).strip()
+        return provider_input or None
+    except Exception as e:
+        logging.error(f"❌⠀ Error memilih provider: {str(e)}")
+        return None
+
+
 def select_provider(providers: List[str]) -> Optional[str]:
     if not providers:
         console.print("⚠️ [yellow]Tidak ada provider yang tersedia.[/yellow]")
@@ -806,11 +803,378 @@ def select_provider(providers: List[str]) -> Optional[str]:
         return None
 
 
+# Nilai --output untuk subcommand scrape, dipetakan ke opsi select_output_option
+OUTPUT_CHOICES = {"excel": "1", "individual": "2", "both": "3", "db": "4"}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="FileCrypt Scraper. Tanpa argumen, menu interaktif dijalankan."
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    scrape = subparsers.add_parser("scrape", help="Scrape URL tanpa prompt")
+    scrape.add_argument(
+        "--url", action="append", default=[], help="URL container (boleh berulang)"
+    )
+    scrape.add_argument("--file", help="File .txt berisi daftar URL")
+    scrape.add_argument(
+        "--stale",
+        action="store_true",
+        help="Scrape ulang container yang punya link kedaluwarsa",
+    )
+    scrape.add_argument("--provider", help="Hanya scrape provider ini")
+    scrape.add_argument(
+        "--output",
+        choices=[*OUTPUT_CHOICES, *STREAM_FORMATS],
+        default="db",
+        help="Output setelah scrape (default: db saja)",
+    )
+    scrape.add_argument(
+        "--tabs", type=int, help="Jumlah tab (bersamaan hanya dengan engine async)"
+    )
+    scrape.add_argument(
+        "--processes", type=int, help="Jumlah proses browser (profil kloningan)"
+    )
+    scrape.add_argument(
+        "--engine", choices=["sync", "async"], help="Engine untuk beberapa URL"
+    )
+    scrape.add_argument(
+        "--headless", action="store_true", help="Jalankan browser tanpa jendela"
+    )
+    scrape.add_argument(
+        "--refresh", action="store_true", help="Resolve ulang link kedaluwarsa"
+    )
+    scrape.add_argument(
+        "--no-skip",
+        action="store_true",
+        help="Jangan lewati container yang tidak berubah",
+    )
+
+    export = subparsers.add_parser("export", help="Export data dari database")
+    export.add_argument("--format", choices=["excel", *STREAM_FORMATS], default="excel")
+    export.add_argument(
+        "--target-code",
+        action="append",
+        default=[],
+        help="Target code (boleh berulang)",
+    )
+    export.add_argument("--provider", help="Filter provider (hanya CSV/JSONL)")
+    export.add_argument(
+        "--per-container", action="store_true", help="Satu file per container"
+    )
+
+    db = subparsers.add_parser("db", help="Tampilkan isi database")
+    db.add_argument("--target-code", help="Tampilkan baris satu container")
+    db.add_argument(
+        "--stale", action="store_true", help="Hanya container dengan link kedaluwarsa"
+    )
+    db.add_argument(
+        "--limit", type=int, default=0, help="Batas jumlah baris (0 = semua)"
+    )
+
+    enqueue = subparsers.add_parser("enqueue", help="Tambah URL ke antrian daemon")
+    enqueue.add_argument(
+        "--url", action="append", default=[], help="URL container (boleh berulang)"
+    )
+    enqueue.add_argument("--file", help="File .txt berisi daftar URL")
+    enqueue.add_argument(
+        "--stale",
+        action="store_true",
+        help="Antrikan container yang punya link kedaluwarsa",
+    )
+    enqueue.add_argument("--provider", help="Hanya scrape provider ini")
+
+    daemon = subparsers.add_parser(
+        "daemon", help="Proses antrian job terus-menerus dengan satu browser"
+    )
+    daemon.add_argument(
+        "--headless", action="store_true", help="Jalankan browser tanpa jendela"
+    )
+    daemon.add_argument(
+        "--refresh", action="store_true", help="Resolve ulang link kedaluwarsa"
+    )
+    daemon.add_argument("--poll", type=float, help="Jeda (detik) saat antrian kosong")
+    daemon.add_argument(
+        "--exit-when-empty",
+        action="store_true",
+        help="Berhenti ketika antrian kosong",
+    )
+
+    jobs = subparsers.add_parser("jobs", help="Tampilkan antrian dan throughput job")
+    jobs.add_argument("--status", choices=JOB_STATUSES, help="Filter status job")
+    jobs.add_argument(
+        "--limit", type=int, default=20, help="Jumlah job terbaru (0 = semua)"
+    )
+    jobs.add_argument(
+        "--days", type=int, default=7, help="Rentang hari statistik throughput"
+    )
+    return parser
+
+
+def apply_cli_overrides(args: argparse.Namespace):
+    """Opsi CLI menimpa config.yaml hanya untuk proses ini"""
+    if getattr(args, "tabs", None):
+        DEFAULT_CONFIG.scraper.concurrent_tabs = max(1, args.tabs)
+    if getattr(args, "processes", None):
+        DEFAULT_CONFIG.scraper.processes = max(1, args.processes)
+    if getattr(args, "engine", None):
+        DEFAULT_CONFIG.scraper.engine = args.engine
+    if args.headless:
+        DEFAULT_CONFIG.browser.headless = True
+    if getattr(args, "no_skip", False):
+        DEFAULT_CONFIG.scraper.skip_unchanged = False
+
+
+def cli_scrape(args: argparse.Namespace) -> int:
+    apply_cli_overrides(args)
+    urls = list(args.url)
+    if args.file:
+        urls.extend(read_urls_file(args.file))
+    stale_urls = get_stale_urls() if args.stale else []
+    if args.refresh:
+        urls, stale_urls = list(dict.fromkeys(urls + stale_urls)), []
+    else:
+        urls = [url for url in dict.fromkeys(urls) if url not in stale_urls]
+    if not urls and not stale_urls:
+        console.print("❌⠀ [red]Tidak ada URL untuk di-scrape[/red]")
+        return 1
+
+    # URL dari --stale selalu di-refresh, URL lain hanya dengan --refresh
+    processed_target_codes, container_titles = [], {}
+    for batch, refresh in ((urls, args.refresh or None), (stale_urls, True)):
+        if not batch:
+            continue
+        use_runner = len(batch) > 1 and (
+            DEFAULT_CONFIG.scraper.concurrent_tabs > 1
+            or DEFAULT_CONFIG.scraper.processes > 1
+            or DEFAULT_CONFIG.scraper.engine == "async"
+        )
+        target_codes, titles = scrape_urls(
+            batch, use_runner, args.provider, interactive=False, refresh=refresh
+        )
+        processed_target_codes.extend(target_codes)
+        container_titles.update(titles)
+    if not processed_target_codes:
+        console.print(
+            "⚠️ [yellow]Tidak ada data yang berhasil di-scrape dari URL manapun[/yellow]"
+        )
+        return 1
+
+    if args.output in OUTPUT_CHOICES:
+        write_outputs(
+            OUTPUT_CHOICES[args.output],
+            processed_target_codes,
+            container_titles,
+            interactive=False,
+        )
+    else:
+        write_outputs(
+            "6",
+            processed_target_codes,
+            container_titles,
+            fmt=args.output,
+            interactive=False,
+        )
+    return 0
+
+
+def cli_export(args: argparse.Namespace) -> int:
+    target_codes = list(args.target_code)
+    if args.per_container and not target_codes:
+        target_codes = [c.target_code for c in DatabaseHandler.get_containers()]
+
+    if args.format == "excel":
+        if args.provider:
+            console.print(
+                "⚠️ [yellow]--provider hanya berlaku untuk CSV/JSONL[/yellow]"
+            )
+        if target_codes:
+            save_individual_outputs(target_codes, {})
+        else:
+            save_database_excel()
+        return 0
+
+    if not target_codes:
+        stream_export("RESULT_DATABASE", fmt=args.format, provider=args.provider)
+        return 0
+    for target_code in target_codes:
+        container = DatabaseHandler.get_container(target_code)
+        stream_export(
+            container.title if container and container.title else target_code,
+            target_code,
+            fmt=args.format,
+            provider=args.provider,
+        )
+    return 0
+
+
+def cli_db(args: argparse.Namespace) -> int:
+    if args.target_code:
+        data = DatabaseHandler.get_data_by_target_code(args.target_code)
+        if args.limit:
+            data = data[: args.limit]
+        print(
+            tabulate(
+                [
+                    (
+                        item.title,
+                        item.provider,
+                        item.size,
+                        item.status,
+                        item.download_url,
+                    )
+                    for item in data
+                ],
+                headers=["Title", "Provider", "Size", "Status", "Download URL"],
+            )
+        )
+        return 0 if data else 1
+
+    containers = (
+        DatabaseHandler.get_stale_containers()
+        if args.stale
+        else DatabaseHandler.get_containers()
+    )
+    if args.limit:
+        containers = containers[: args.limit]
+    print(
+        tabulate(
+            [
+                (
+                    c.target_code,
+                    c.title or "-",
+                    c.episode_count if c.episode_count is not None else "-",
+                    c.row_count,
+                    ",".join(c.providers),
+                    c.last_scraped_at or "-",
+                )
+                for c in containers
+            ],
+            headers=[
+                "Target Code",
+                "Title",
+                "Episode",
+                "Item",
+                "Provider",
+                "Terakhir Scrape",
+            ],
+        )
+    )
+    return 0
+
+
+def cli_enqueue(args: argparse.Namespace) -> int:
+    urls = list(args.url)
+    if args.file:
+        urls.extend(read_urls_file(args.file))
+    stale_urls = get_stale_urls() if args.stale else []
+    urls = [url for url in dict.fromkeys(urls) if url not in stale_urls]
+    if not urls and not stale_urls:
+        console.print("❌⠀ [red]Tidak ada URL untuk diantrikan[/red]")
+        return 1
+    # Job dari --stale ditandai refresh supaya daemon me-resolve ulang linknya
+    added = JobQueue.enqueue(urls, args.provider)
+    added += JobQueue.enqueue(stale_urls, args.provider, refresh=True)
+    total = len(urls) + len(stale_urls)
+    console.print(
+        f"✅ [white]{added} job ditambahkan, {total - added} sudah ada di antrian[/white]"
+    )
+    return 0
+
+
+def cli_daemon(args: argparse.Namespace) -> int:
+    apply_cli_overrides(args)
+    with BrowserSession() as session:
+        JobDaemon(
+            session,
+            poll_interval=args.poll,
+            exit_when_empty=args.exit_when_empty,
+            refresh=args.refresh or None,
+        ).run()
+    return 0
+
+
+def cli_jobs(args: argparse.Namespace) -> int:
+    counts = JobQueue.counts()
+    console.print(" | ".join(f"{status}: {count}" for status, count in counts.items()))
+    print(
+        tabulate(
+            [
+                (
+                    day,
+                    done,
+                    failed,
+                    rows,
+                    new_rows,
+                    f"{seconds:.1f}" if seconds is not None else "-",
+                )
+                for day, done, failed, rows, new_rows, seconds in JobQueue.daily_stats(
+                    args.days
+                )
+            ],
+            headers=["Tanggal", "Done", "Failed", "Item", "Item Baru", "Detik/Job"],
+        )
+    )
+    print()
+    print(
+        tabulate(
+            [
+                (
+                    job.id,
+                    job.target_code or "-",
+                    job.status,
+                    job.attempts,
+                    job.rows if job.rows is not None else "-",
+                    f"{job.seconds:.1f}" if job.seconds is not None else "-",
+                    job.finished_at or job.started_at or job.enqueued_at,
+                    (job.error or "")[:60],
+                )
+                for job in JobQueue.get_jobs(args.status, args.limit)
+            ],
+            headers=[
+                "ID",
+                "Target Code",
+                "Status",
+                "Percobaan",
+                "Item",
+                "Detik",
+                "Waktu",
+                "Error",
+            ],
+        )
+    )
+    return 0
+
+
+def run_cli(args: argparse.Namespace) -> int:
+    """Menjalankan subcommand CLI dan mengembalikan exit code"""
+    setup_logging()
+    DatabaseHandler._init_db()
+    commands = {
+        "scrape": cli_scrape,
+        "export": cli_export,
+        "db": cli_db,
+        "enqueue": cli_enqueue,
+        "daemon": cli_daemon,
+        "jobs": cli_jobs,
+    }
+    return commands[args.command](args)
+
+
 if __name__ == "__main__":
+    args = build_parser().parse_args()
     try:
         for ext in DEFAULT_CONFIG.extensions.paths:
             if not os.path.exists(os.path.join(ext, "manifest.json")):
-                raise FileNotFoundError(f"❌⠀ Ekstensi tidak valid di: {ext}")
+                if not DEFAULT_CONFIG.blocking.enabled:
+                    raise FileNotFoundError(f"❌⠀ Ekstensi tidak valid di: {ext}")
+                console.print(
+                    f"⚠️ [yellow]Ekstensi tidak ditemukan di {ext}, memakai pemblokiran bawaan[/yellow]"
+                )
+
+        if args.command:
+            sys.exit(run_cli(args))
 
         console.print(
             Panel(
@@ -2,8 +2,8 @@
 Model data untuk aplikasi FileCrypt Scraper
 """
 
-from dataclasses import dataclass
-from typing import Optional, Any, List, Dict
+from dataclasses import dataclass, field
+from typing import Optional, Any, List, Dict, Tuple
 
 
 @dataclass
@@ -22,6 +22,107 @@ class ScrapedData:
     container_title: str = "N/A"
     download_button: Optional[Any] = None
     row_element: Optional[Any] = None
+    attempts: int = 0
+    # True jika link di-resolve pada proses ini (bukan dimuat dari database)
+    resolved: bool = False
+
+
+@dataclass
+class ContainerResult:
+    """
+    Hasil scraping satu container
+    """
+
+    url: str
+    target_code: str
+    container_title: str
+    data: List[ScrapedData] = field(default_factory=list)
+    error: Optional[str] = None
+    episode_count: Optional[int] = None
+    # Hash daftar baris, hanya diisi jika semua provider ter-scrape tanpa ERROR
+    fingerprint: Optional[str] = None
+    # True jika daftar baris sama dengan scrape terakhir dan popup dilewati
+    unchanged: bool = False
+    # "password"/"captcha" jika container sempat diparkir menunggu manusia
+    needs_attention: Optional[str] = None
+
+
+@dataclass
+class ExportResult:
+    """
+    Hasil export satu workbook individual
+    """
+
+    target_code: str
+    filename: str
+    rows: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class ContainerInfo:
+    """
+    Metadata container yang tersimpan di tabel containers
+    """
+
+    target_code: str
+    title: Optional[str]
+    episode_count: Optional[int]
+    providers: List[str]
+    first_scraped_at: str
+    last_scraped_at: str
+    row_count: int
+    fingerprint: Optional[str] = None
+    url: Optional[str] = None
+
+
+@dataclass
+class BulkWriteResult:
+    """
+    Hasil penulisan massal: key (title, provider, target_code) yang baru
+    disimpan dan yang sudah ada sebelumnya
+    """
+
+    new_keys: List[Tuple[str, str, str]] = field(default_factory=list)
+    duplicate_keys: List[Tuple[str, str, str]] = field(default_factory=list)
+    # Subset duplicate_keys yang link-nya diperbarui (refresh)
+    updated_keys: List[Tuple[str, str, str]] = field(default_factory=list)
+
+    @property
+    def new_count(self) -> int:
+        return len(self.new_keys)
+
+    @property
+    def updated_count(self) -> int:
+        return len(self.updated_keys)
+
+    @property
+    def duplicate_count(self) -> int:
+        return len(self.duplicate_keys)
+
+
+@dataclass
+class Job:
+    """
+    Satu job di antrian daemon (tabel jobs)
+    """
+
+    id: int
+    url: str
+    target_code: Optional[str]
+    provider: Optional[str]
+    status: str
+    attempts: int
+    worker: Optional[str] = None
+    enqueued_at: Optional[str] = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    seconds: Optional[float] = None
+    rows: Optional[int] = None
+    new_rows: Optional[int] = None
+    error: Optional[str] = None
+    refresh: bool = False
 
 
 @dataclass
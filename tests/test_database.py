@@ -0,0 +1,56 @@
+"""
+Test bulk_insert dengan database SQLite sementara
+"""
+
+import sqlite3
+
+import pytest
+
+from core.database import bulk_insert
+from core.migrations import migrate
+from models.data_models import ScrapedData
+
+
+def make_item(title: str, download_url: str = "https://send.now/abc") -> ScrapedData:
+    return ScrapedData(
+        title=title,
+        provider="Send",
+        size="1 GB",
+        status="online",
+        download_url=download_url,
+        bypass_url="N/A",
+        target_code="ABC123",
+        resolved=True,
+    )
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "scraped_data.db"))
+    migrate(conn)
+    yield conn
+    conn.close()
+
+
+def test_duplicate_within_batch_is_not_counted_as_updated(conn):
+    result = bulk_insert(
+        conn, "scraped_data", [make_item("a"), make_item("b"), make_item("a")]
+    )
+
+    assert result.new_count == 2
+    assert result.duplicate_count == 1
+    assert result.updated_count == 0
+
+
+def test_existing_row_is_counted_as_updated_once(conn):
+    bulk_insert(conn, "scraped_data", [make_item("a")])
+
+    result = bulk_insert(
+        conn,
+        "scraped_data",
+        [make_item("a", "https://send.now/new"), make_item("a"), make_item("b")],
+    )
+
+    assert result.new_keys == [("b", "Send", "ABC123")]
+    assert result.duplicate_count == 2
+    assert result.updated_keys == [("a", "Send", "ABC123")]
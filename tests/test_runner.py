@@ -0,0 +1,137 @@
+"""
+Test MultiTabRunner dengan halaman/scraper palsu (tanpa Playwright)
+"""
+
+from types import SimpleNamespace
+
+import core.runner as runner
+from config import DEFAULT_CONFIG
+from core.browser import BrowserSession
+from models.data_models import ContainerResult
+
+URL_LOCKED = "https://filecrypt.cc/Container/AAAA.html"
+URL_SECOND = "https://filecrypt.cc/Container/BBBB.html"
+URL_THIRD = "https://filecrypt.cc/Container/CCCC.html"
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.url = "about:blank"
+        self.closed = False
+
+    def on(self, *_):
+        pass
+
+    def goto(self, url, **_):
+        self.url = url
+
+    def wait_for_load_state(self, *_, **__):
+        pass
+
+    def wait_for_timeout(self, *_):
+        pass
+
+    def bring_to_front(self):
+        pass
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+        self.context.pages.remove(self)
+
+
+class FakeContext:
+    def __init__(self, generation):
+        self.generation = generation
+        self.pages = []
+
+    def on(self, *_):
+        pass
+
+    def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+
+class FakeSession(BrowserSession):
+    """BrowserSession asli dengan konteks palsu; starts menghitung (re)start"""
+
+    def __init__(self, restart_after):
+        super().__init__(restart_after)
+        self.starts = 0
+
+    def start(self):
+        self.starts += 1
+        self.manager = SimpleNamespace(context=FakeContext(self.starts))
+        self.containers_served = 0
+        self._crashed = False
+
+    def stop(self):
+        self.manager = None
+
+
+class FakeScraper:
+    """Halaman URL_LOCKED meminta password sampai URL_THIRD selesai di-scrape"""
+
+    scraped = []
+
+    def __init__(self, page, refresh=None):
+        self.page = page
+
+    def wait_until_ready(self):
+        return True
+
+    def detect_password(self):
+        return self.page.url == URL_LOCKED and URL_THIRD not in FakeScraper.scraped
+
+    def detect_captcha(self):
+        return False
+
+
+def fake_scrape_container(scraper, url, selected_provider=None):
+    FakeScraper.scraped.append(url)
+    return ContainerResult(
+        url=url,
+        target_code=runner.get_target_code(url),
+        container_title=url,
+        episode_count=scraper.page.context.generation,
+    )
+
+
+def test_parked_container_does_not_block_restart_after(monkeypatch):
+    monkeypatch.setattr(DEFAULT_CONFIG.scraper, "park_interactive", True)
+    monkeypatch.setattr(runner, "FileCryptScraper", FakeScraper)
+    monkeypatch.setattr(runner, "scrape_container", fake_scrape_container)
+    monkeypatch.setattr(runner.StorageState, "save", staticmethod(lambda *_: None))
+    monkeypatch.setattr(FakeScraper, "scraped", [])
+
+    session = FakeSession(restart_after=1)
+    session.start()
+    multi = runner.MultiTabRunner(session, tabs=1)
+    # Batas waktu pendek: jika runner macet, container terkunci timeout
+    multi.timeouts = SimpleNamespace(password=2, captcha=2, page_load=1000)
+
+    results = multi.run([URL_LOCKED, URL_SECOND, URL_THIRD])
+
+    assert [result.url for result in results] == [URL_SECOND, URL_THIRD, URL_LOCKED]
+    assert all(result.error is None for result in results)
+    assert results[-1].needs_attention == "password"
+    # restart_after tercapai setelah URL_SECOND, tapi restart ditunda selama
+    # URL_LOCKED diparkir: semuanya diproses di konteks yang sama
+    assert {result.episode_count for result in results} == {1}
+    assert session.starts == 1
+
+
+def test_new_page_defers_restart_only_when_requested():
+    session = FakeSession(restart_after=1)
+    session.start()
+    session.mark_container_done()
+
+    session.new_page(defer_restart=True)
+    assert session.starts == 1
+    session.new_page()
+    assert session.starts == 2